@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark frontmatter loading against the YAML loaders."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+# Add tools directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from lib.frontmatter import load_frontmatter
+from lib.parser import MSLParser
+
+
+def collect_frontmatter(paths):
+    """Return the frontmatter text of every markdown file under paths."""
+    blocks = []
+    for root in paths:
+        root = Path(root)
+        files = [root] if root.is_file() else sorted(root.glob('**/*.md'))
+        for file_path in files:
+            content = file_path.read_text(encoding='utf-8')
+            end = content.find('---', 3)
+            if content.startswith('---') and end != -1:
+                blocks.append(content[3:end])
+    return blocks
+
+
+def time_loader(load, blocks, rounds):
+    """Return the best time in seconds to load every block once."""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for block in blocks:
+            try:
+                load(block)
+            except yaml.YAMLError:
+                pass
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """Run the benchmark and print a comparison."""
+    repo = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description="Benchmark frontmatter loading")
+    parser.add_argument("paths", nargs="*", default=[str(repo / 'specs'), str(repo / 'examples')],
+                        help="Files or directories to read frontmatter from")
+    parser.add_argument("--rounds", type=int, default=20, help="Timing rounds (best is reported)")
+    args = parser.parse_args()
+
+    blocks = collect_frontmatter(args.paths)
+    if not blocks:
+        print("No frontmatter found")
+        return 1
+
+    # Every loader must agree before timings mean anything
+    expected = [yaml.safe_load(block) for block in blocks]
+    assert [load_frontmatter(block) for block in blocks] == expected
+
+    loaders = [("yaml.safe_load", yaml.safe_load)]
+    if hasattr(yaml, 'CSafeLoader'):
+        loaders.append(("CSafeLoader", lambda block: yaml.load(block, Loader=yaml.CSafeLoader)))
+    loaders.append(("load_frontmatter", load_frontmatter))
+
+    print(f"{len(blocks)} frontmatter blocks, best of {args.rounds} rounds")
+    baseline = None
+    for name, load in loaders:
+        elapsed = time_loader(load, blocks, args.rounds)
+        baseline = baseline or elapsed
+        per_block = elapsed / len(blocks) * 1e6
+        print(f"  {name:<18} {elapsed * 1000:8.2f} ms  {per_block:7.1f} us/block  {baseline / elapsed:5.1f}x")
+
+    # Whole-file parse cost, where frontmatter used to dominate
+    files = [path for root in args.paths
+             for path in ([Path(root)] if Path(root).is_file() else sorted(Path(root).glob('**/*.md')))]
+    contents = [(path.read_text(encoding='utf-8'), str(path)) for path in files]
+    msl_parser = MSLParser(keep_raw_content=False)
+    elapsed = time_loader(lambda item: msl_parser.parse_content(*item), contents, args.rounds)
+    print(f"Full parse of {len(contents)} files: {elapsed * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
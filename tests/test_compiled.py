@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Test the compiled binary spec format."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from lib.compiled import CompiledSpec, compile_document, load_compiled, write_compiled
+from lib.parser import MSLParser
+from lib.requirement import Requirement
+
+
+SPEC = """---
+id: compiled-spec
+created: 2024-01-15
+tags: [core, é]
+---
+# Compiled Spec ✓
+
+## Summary
+Loads without parsing.
+
+## Requirements
+- REQ-001: [!|security|progress:50%|-> src/auth.py:10] Encrypt data
+  - Child requirement
+    - [x] Grandchild
+- REQ-002: [OVERRIDE] Replaced
+- Plain requirement
+
+## Notes
+Nothing else.
+"""
+
+
+def test_compiled_matches_parse(temp_dir):
+    """Test that a compiled spec reads back as the parse result."""
+    parsed = MSLParser(keep_raw_content=False).parse_content(SPEC, "compiled-spec.md")
+    path = temp_dir / "spec.mslc"
+    write_compiled(parsed, str(path))
+
+    with load_compiled(str(path)) as compiled:
+        assert isinstance(compiled, CompiledSpec)
+        assert compiled == parsed
+        assert list(compiled) == list(parsed)
+        assert str(compiled["metadata"]["created"]) == "2024-01-15"
+        assert compiled["sections"] == parsed["sections"]
+
+        first = compiled["requirements"][0]
+        assert first["code_links"][0]["file"] == "src/auth.py"
+        assert first["metrics"] == {"progress": "50%"}
+        grandchild = first["children"][0]["children"][0]
+        assert (grandchild["id"], grandchild["status"], grandchild.line) == ("REQ-001.1.1", "complete", 14)
+        assert "parent_ref" not in compiled["requirements"][2]
+
+        # Decoded copies are ordinary, editable requirements
+        copy = compiled.to_dict()
+        assert copy == parsed
+        assert isinstance(copy["requirements"][0]["children"][0], Requirement)
+        assert [req.column for req in copy["requirements"][0].walk()] == [1, 3, 5]
+
+
+def test_compiled_rejects_bad_input(temp_dir):
+    """Test that unsupported values and foreign files raise ValueError."""
+    parsed = MSLParser().parse_content(SPEC)
+    parsed["requirements"][0]["markers"]["when"] = (1, 2)
+    with pytest.raises(ValueError):
+        compile_document(parsed)
+
+    path = temp_dir / "spec.mslc"
+    path.write_bytes(b"not a compiled spec, just some bytes padded out" * 2)
+    with pytest.raises(ValueError):
+        load_compiled(str(path))
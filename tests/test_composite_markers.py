@@ -213,4 +213,37 @@ def test_complex_real_world_example(msl_parser):
     
 
 
+def test_registered_marker_keys():
+    """Test routing new marker keys through the grammar registration API."""
+    from lib.markers import MarkerGrammar
+    from lib.parser import MSLParser
+    
+    grammar = MarkerGrammar()
+    grammar.register_key("owner", "assignee")
+    grammar.register_key("risk", "metrics")
+    grammar.register_component("frontend", "categories")
+    grammar.register_component("P0", "priority", "critical")
+    parser = MSLParser(grammar=grammar)
+    
+    content = """# Test Spec
+## Requirements
+- REQ-001: [owner:alice|risk:high|frontend|P0] Registered markers
+- REQ-002: [frontend] Simple markers keep their own table
+"""
+    
+    parsed = parser.parse_content(content)
+    reqs = parsed["requirements"]
+    
+    assert reqs[0]["assignee"] == "alice"
+    assert reqs[0]["metrics"]["risk"] == "high"
+    assert reqs[0]["categories"] == ["frontend"]
+    assert reqs[0]["priority"] == "critical"
+    assert reqs[1]["markers"]["frontend"] == True
+    
+    # Other parsers are unaffected
+    other = MSLParser().parse_content(content)["requirements"]
+    assert other[0]["markers"]["owner"] == "alice"
+    
+
+
 # Tests are now run via pytest - no main block needed
\ No newline at end of file
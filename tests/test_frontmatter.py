@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Test fast frontmatter loading."""
+
+import sys
+import datetime
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from lib.frontmatter import load_frontmatter, _load_simple
+
+
+def test_flat_frontmatter_keeps_yaml_types():
+    """Test that scalars resolve exactly as the YAML loader resolves them."""
+    text = """
+id: typed-spec
+version: 1.0
+count: 3
+draft: yes
+owner: ~
+created: 2024-01-15
+tags: [api, 1, true]
+title: 'Quoted: title'
+"""
+    data = _load_simple(text)
+
+    assert data == yaml.safe_load(text)
+    assert data["version"] == 1.0 and data["count"] == 3
+    assert data["draft"] is True and data["owner"] is None
+    assert data["created"] == datetime.date(2024, 1, 15)
+    assert data["tags"] == ["api", 1, True]
+
+
+def test_nested_blocks():
+    """Test one level of nested mappings and sequences."""
+    text = """
+variables:
+  service_name: Payment Service
+  rate_limit: 100
+references:
+  - msl-core: "Language specification"
+  - plain-item
+extends:
+"""
+    data = _load_simple(text)
+
+    assert data == yaml.safe_load(text)
+    assert data["variables"] == {"service_name": "Payment Service", "rate_limit": 100}
+    assert data["references"] == [{"msl-core": "Language specification"}, "plain-item"]
+    assert data["extends"] is None
+
+
+def test_complex_yaml_falls_back():
+    """Test that YAML beyond the simple subset still loads, or fails, as before."""
+    text = """
+anchors: &base
+  a: 1
+copy: *base
+block: |
+  multi
+  line
+"""
+    assert load_frontmatter(text) == yaml.safe_load(text)
+
+    with pytest.raises(yaml.YAMLError):
+        load_frontmatter("bad: [\n")
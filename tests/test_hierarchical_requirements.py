@@ -298,4 +298,41 @@ def test_flat_list_still_works():
     
 
 
+def test_streaming_requirements(tmp_path):
+    """Test streaming requirements one at a time with hierarchy info."""
+    parser = MSLParser()
+    
+    spec_file = tmp_path / "stream.md"
+    spec_file.write_text("""---
+id: stream-spec
+---
+# Stream Spec
+## Summary
+- Not a requirement
+## Requirements
+- REQ-001: Parent
+  - First child
+    - Grandchild
+  - REQ-001.2: Second child
+- REQ-002: [!] Sibling
+""")
+    
+    stream = parser.iter_requirements(str(spec_file))
+    first = next(stream)
+    assert first["id"] == "REQ-001"
+    assert first["depth"] == 0
+    
+    rest = list(stream)
+    assert [(r["id"], r["depth"], r["parent_id"]) for r in rest] == [
+        ("REQ-001.1", 1, "REQ-001"),
+        ("REQ-001.1.1", 2, "REQ-001.1"),
+        ("REQ-001.2", 1, "REQ-001"),
+        ("REQ-002", 0, None),
+    ]
+    assert rest[-1]["priority"] == "critical"
+    
+    # Children are not attached while streaming
+    assert first["children"] == []
+
+
 # Tests are now run via pytest - no main block needed
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Test the persistent parse cache."""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from lib.cache import ParseCache
+from lib.parser import MSLParser
+from lib.validator import MSLValidator
+
+
+SPEC = """---
+id: cached-spec
+---
+# Cached Spec
+## Requirements
+- REQ-001: [!|security] Encrypt data
+  - Child requirement
+"""
+
+
+def test_cache_hit_skips_parsing(temp_dir, monkeypatch):
+    """Test that a warm cache returns the same result without parsing."""
+    spec_file = temp_dir / "spec.md"
+    spec_file.write_text(SPEC)
+    cache = ParseCache(str(temp_dir / "cache"))
+
+    cold = MSLParser(cache=cache).parse_file(str(spec_file))
+    assert cold == MSLParser().parse_file(str(spec_file))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parsed despite a cache hit")
+
+    parser = MSLParser(cache=cache)
+    monkeypatch.setattr(parser, "_parse_text", fail)
+    warm = parser.parse_file(str(spec_file))
+
+    assert warm == cold
+    assert warm["requirements"][0]["children"][0]["id"] == "REQ-001.1"
+    assert warm["raw_content"] == SPEC
+
+
+def test_cache_misses_on_change(temp_dir):
+    """Test that content and grammar changes are not served from the cache."""
+    spec_file = temp_dir / "spec.md"
+    spec_file.write_text(SPEC)
+    cache = ParseCache(str(temp_dir / "cache"))
+    parser = MSLParser(cache=cache)
+
+    parser.parse_file(str(spec_file))
+    spec_file.write_text(SPEC.replace("Encrypt", "Hash"))
+    assert parser.parse_file(str(spec_file))["requirements"][0]["text"] == "Hash data"
+
+    parser.grammar.register_component("security", "markers")
+    reparsed = parser.parse_file(str(spec_file))["requirements"][0]
+    assert reparsed["markers"] == {"security": True}
+
+
+def test_cache_eviction_and_corruption(temp_dir):
+    """Test that the cache stays under its size limit and drops bad entries."""
+    cache = ParseCache(str(temp_dir / "cache"), max_bytes=2000)
+
+    for i in range(20):
+        cache.put(cache.key(str(i).encode(), "spec.md"), {"payload": "x" * 500 + str(i)})
+    assert cache.size() <= 2000
+    assert cache.get(cache.key(b"19", "spec.md"))["payload"].endswith("19")
+
+    key = cache.key(b"bad", "spec.md")
+    cache.put(key, {"payload": 1})
+    cache._path(key).write_bytes(b"not a cache entry")
+    assert cache.get(key) is None
+    assert not cache._path(key).exists()
+
+
+def test_validator_uses_given_parser(temp_dir):
+    """Test that the validator can share a caching parser."""
+    spec_file = temp_dir / "spec.md"
+    spec_file.write_text(SPEC)
+    cache = ParseCache(str(temp_dir / "cache"))
+    validator = MSLValidator(parser=MSLParser(keep_raw_content=False, cache=cache))
+
+    first = [str(issue) for issue in validator.validate_file(str(spec_file))]
+    assert [str(issue) for issue in validator.validate_file(str(spec_file))] == first
+    assert cache.size() > 0
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Test core document parsing."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from lib.parser import MSLParser
+from lib.requirement import Requirement
+
+
+def test_sections_and_frontmatter():
+    """Test frontmatter, title and section extraction in one document."""
+    parser = MSLParser()
+
+    content = """---
+id: sections-spec
+status: active
+---
+
+# Sections Spec
+
+## Summary
+  A short summary.
+
+## Requirements
+- REQ-001: First
+  - Child
+
+## Notes
+Some notes.
+"""
+
+    parsed = parser.parse_content(content)
+
+    assert parsed["metadata"]["id"] == "sections-spec"
+    assert parsed["metadata"]["status"] == "active"
+    assert parsed["level"] == 1
+    assert parsed["title"] == "Sections Spec"
+    assert parsed["summary"] == "A short summary."
+    assert parsed["notes"] == "Some notes."
+    assert [req["id"] for req in parsed["requirements"]] == ["REQ-001"]
+    assert parsed["requirements"][0]["children"][0]["id"] == "REQ-001.1"
+
+
+def test_last_requirements_section_wins():
+    """Test that a repeated section replaces the earlier one."""
+    parser = MSLParser()
+
+    content = """# Spec
+## Requirements
+- REQ-001: Dropped
+## Requirements
+- REQ-002: Kept
+"""
+
+    parsed = parser.parse_content(content)
+
+    assert [req["id"] for req in parsed["requirements"]] == ["REQ-002"]
+
+
+def test_first_requirement_indentation_ignored():
+    """Test that the first line of the section is treated as top-level."""
+    parser = MSLParser()
+
+    content = """# Spec
+## Requirements
+
+    - REQ-001: Indented first line
+  - REQ-001.1: Child
+"""
+
+    parsed = parser.parse_content(content)
+    reqs = parsed["requirements"]
+
+    assert len(reqs) == 1
+    assert reqs[0]["depth"] == 0
+    assert reqs[0]["children"][0]["id"] == "REQ-001.1"
+
+
+def test_html_comment_extends():
+    """Test HTML comment style extends without frontmatter."""
+    parser = MSLParser()
+
+    content = """<!-- extends: base-spec -->
+# Child Spec
+## Requirements
+- REQ-001: Something
+"""
+
+    parsed = parser.parse_content(content)
+
+    assert parsed["metadata"]["extends"] == "base-spec"
+    assert parsed["level"] == 2
+    assert parsed["title"] == "Child Spec"
+    assert len(parsed["requirements"]) == 1
+
+
+def test_requirement_dict_view():
+    """Test that Requirement objects behave like the old requirement dicts."""
+    import pickle
+    parser = MSLParser()
+
+    content = """# Spec
+## Requirements
+- REQ-001.2: [-> src/app.py:10|!] Linked requirement
+- Plain requirement
+"""
+
+    reqs = parser.parse_content(content)["requirements"]
+    linked, plain = reqs
+
+    assert isinstance(linked, Requirement)
+    assert linked["parent_ref"] == "REQ-001"
+    assert linked["code_links"][0]["file"] == "src/app.py"
+    assert "code_links" not in plain
+    assert "parent_ref" not in plain
+    assert plain.get("hierarchy_level") is None
+
+    # Empty containers are allocated on first use and then kept
+    plain["tags"].append("later")
+    assert plain["tags"] == ["later"]
+
+    # Unknown keys, copies and equality follow dict semantics
+    merged = linked.copy()
+    merged.update({"text": "Changed", "owner": "alice"})
+    assert merged["owner"] == "alice"
+    assert linked["text"] == "Linked requirement"
+    assert dict(plain) == plain
+    assert pickle.loads(pickle.dumps(linked)) == linked
+    assert linked.to_dict()["priority"] == "critical"
+
+
+def test_raw_content_opt_out(temp_dir):
+    """Test that parsed documents can drop their source text."""
+    from lib.parser import SourceText
+
+    spec_file = temp_dir / "spec.md"
+    spec_file.write_text("# Spec\n## Requirements\n- REQ-001: Something\n")
+
+    kept = MSLParser().parse_file(str(spec_file))
+    assert kept["raw_content"].startswith("# Spec")
+
+    parser = MSLParser(keep_raw_content=False)
+    parsed = parser.parse_file(str(spec_file))
+    assert isinstance(parsed["raw_content"], SourceText)
+    assert str(parsed["raw_content"]) == kept["raw_content"]
+    assert parsed["requirements"][0]["id"] == "REQ-001"
+
+    assert parser.parse_content("# Spec\n")["raw_content"] is None
+
+
+def test_parse_bytes_and_path_match_text(temp_dir):
+    """Test that the bytes and memory-mapped paths give the text parse result."""
+    content = """---
+id: bytes-spec
+tags: [a, b]
+---
+
+# Bytes Spec ✓
+
+## Summary
+Résumé of the spec.
+
+## Requirements
+- REQ-001: [!|security] Encrypt data
+  - Child requirement
+
+## Appendix
+Large generated content that is never decoded.
+"""
+    parser = MSLParser()
+    expected = parser.parse_content(content, "bytes-spec.md")
+
+    from_bytes = parser.parse_bytes(content.encode('utf-8'), "bytes-spec.md")
+    assert from_bytes == expected
+
+    spec_file = temp_dir / "bytes-spec.md"
+    spec_file.write_bytes(content.replace('\n', '\r\n').encode('utf-8'))
+    from_path = parser.parse_path(str(spec_file))
+    assert str(from_path.pop("raw_content")) == content
+    expected.pop("raw_content")
+    expected["source"] = str(spec_file)
+    assert from_path == expected
+
+
+def test_parse_path_bare_heading_fallback(temp_dir):
+    """Test headings that only match across lines in the decoded text."""
+    content = "#\nSpan Title\n##\nRequirements\n- REQ-001: Found\n"
+    spec_file = temp_dir / "bare.md"
+    spec_file.write_text(content)
+
+    parser = MSLParser()
+    parsed = parser.parse_path(str(spec_file))
+
+    assert parsed["title"] == "Span Title"
+    assert parsed["requirements"][0]["id"] == "REQ-001"
+    assert parser.parse_bytes(content.encode()) == parser.parse_content(content)
+
+    # Streaming picks the same section, also with blank lines before the name
+    for content in (content, "##\n\n  Requirements \n- REQ-001: Found\n## \nNotes\n- Not a requirement\n"):
+        spec_file.write_text(content)
+        assert [req["id"] for req in parser.iter_requirements(str(spec_file))] == ["REQ-001"]
+        assert [req["id"] for req in parser.parse_file(str(spec_file))["requirements"]] == ["REQ-001"]
+
+
+def test_section_and_requirement_lines():
+    """Test that sections and requirements record their source lines."""
+    parser = MSLParser()
+
+    content = """---
+id: lines-spec
+---
+# Lines Spec
+
+## Requirements
+
+- REQ-001: First
+  - Child
+- REQ-002: Second
+
+## Notes
+Done.
+"""
+
+    parsed = parser.parse_content(content)
+
+    assert parsed["sections"] == {"requirements": (6, 11), "notes": (12, 13)}
+    first, second = parsed["requirements"]
+    assert (first.line, first["children"][0].line, second.line) == (8, 9, 10)
+    assert "line" not in first
+    
+    # Columns are 1-based and point at the "-" and at the marker block
+    marked = parser.parse_content("# Spec\n## Requirements\n   - REQ-001: [!] A\n     - [x] B\n")["requirements"][0]
+    assert (marked.column, marked.marker_column) == (4, 15)
+    child = marked["children"][0]
+    assert (child.line, child.column, child.marker_column) == (4, 6, 8)
+    assert parser.parse_content("## Requirements\n- Plain\n")["requirements"][0].marker_column is None
+
+
+def test_reparse_reuses_untouched_requirements():
+    """Test that an edit inside the requirements only re-parses nearby subtrees."""
+    parser = MSLParser()
+
+    lines = ["---", "id: edit-spec", "---", "# Edit Spec", "## Requirements"]
+    for i in range(1, 6):
+        lines += [f"- REQ-00{i}: Requirement {i}", "  - Child"]
+    content = "\n".join(lines)
+    previous = parser.parse_content(content)
+    roots = list(previous["requirements"])
+    metadata = previous["metadata"]
+
+    # Replace the child of REQ-003 (line 11) with two lines
+    edited = lines[:10] + ["  - [!] Urgent child", "  - Another child"] + lines[11:]
+    new_content = "\n".join(edited)
+    result = parser.reparse(previous, new_content, 11, 12, 13)
+    expected = parser.parse_content(new_content)
+
+    assert result == expected
+    assert [req.line for req in result["requirements"]] == [6, 8, 10, 13, 15]
+    assert result["requirements"][2]["children"][0]["id"] == "REQ-003.1"
+    assert result["metadata"] is metadata
+    assert result["requirements"][0] is roots[0]
+    assert result["requirements"][4] is roots[4]
+
+    # Frontmatter edits fall back to a full parse
+    retitled = new_content.replace("id: edit-spec", "id: renamed")
+    assert parser.reparse(result, retitled, 2, 3, 3)["metadata"]["id"] == "renamed"
+
+
+def test_parse_many_keeps_order_and_reports_failures(temp_dir):
+    """Test bulk parsing across worker processes."""
+    paths = []
+    for i in range(6):
+        spec_file = temp_dir / f"spec-{i}.md"
+        spec_file.write_text(f"# Spec {i}\n## Requirements\n- REQ-00{i}: Item\n")
+        paths.append(str(spec_file))
+    paths.insert(3, str(temp_dir / "missing.md"))
+
+    parser = MSLParser(keep_raw_content=False)
+    results = list(parser.parse_many(paths, jobs=2))
+
+    assert [path for path, _, _ in results] == paths
+    missing = results[3]
+    assert missing[1] is None and isinstance(missing[2], FileNotFoundError)
+    for path, result, error in results[:3] + results[4:]:
+        assert error is None
+        assert result == parser.parse_file(path)
+
+
+def test_header_only_defers_body(temp_dir):
+    """Test that header-only parsing reads the frontmatter and nothing else."""
+    from lib.parser import LazyDocument
+
+    spec_file = temp_dir / "lazy.md"
+    content = b"---\nid: lazy-spec\nextends: base\n---\n# Lazy\n## Requirements\n- REQ-001: Fine\n- \xff\n"
+    spec_file.write_bytes(content)
+
+    parser = MSLParser()
+    header = parser.parse_file(str(spec_file), header_only=True)
+    assert isinstance(header, LazyDocument)
+    assert (header["level"], header["metadata"]["extends"]) == (1, "base")
+
+    # The body is not valid UTF-8, which only shows once it is needed
+    with pytest.raises(UnicodeDecodeError):
+        header["requirements"]
+
+    spec_file.write_bytes(content.replace(b"\xff", b"REQ-002: Second"))
+    expected = parser.parse_file(str(spec_file))
+    lazy = parser.parse_file(str(spec_file), sections=["title"])
+    assert lazy["sections"] == expected["sections"]
+    assert dict(lazy) == expected
+    assert [req.line for req in lazy["requirements"]] == [7, 8]
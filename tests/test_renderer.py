@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Test template rendering."""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+import pytest
+
+from lib.renderer import MSLRenderer, substitute_variables
+
+
+def test_jinja2_templates_compile_once(monkeypatch):
+    """Test that rendering the same content again reuses the compiled template."""
+    pytest.importorskip("jinja2")
+    renderer = MSLRenderer(max_templates=2)
+    compiled = []
+    compile_template = renderer._env.compile
+    monkeypatch.setattr(renderer._env, "compile",
+                        lambda source, *args, **kwargs: compiled.append(source) or compile_template(source, *args, **kwargs))
+
+    template = "- REQ-001: {{ name }} handles {{ rate }} requests/s"
+    for rate in range(100):
+        assert renderer.render(template, {"name": "API", "rate": rate}) == f"- REQ-001: API handles {rate} requests/s"
+    assert compiled == [template]
+
+    renderer.render("{{ a }}", {"a": 1})
+    renderer.render("{{ b }}", {"b": 2})
+    renderer.render(template, {"name": "API", "rate": 0})
+    assert compiled == [template, "{{ a }}", "{{ b }}", template]
+
+
+def test_jinja2_bytecode_cache(temp_dir, monkeypatch):
+    """Test that compiled templates are reused from disk by a new renderer."""
+    jinja2 = pytest.importorskip("jinja2")
+    MSLRenderer(bytecode_cache=str(temp_dir / "templates")).render("# {{ title }}", {"title": "Spec"})
+    assert list((temp_dir / "templates").iterdir())
+
+    renderer = MSLRenderer(bytecode_cache=str(temp_dir / "templates"))
+    monkeypatch.setattr(renderer._env, "compile", lambda *args, **kwargs: pytest.fail("compiled again"))
+    assert renderer.render("# {{ title }}", {"title": "Other"}) == "# Other"
+    with pytest.raises(jinja2.TemplateSyntaxError):
+        MSLRenderer().render("{% if %}", {})
+
+
+def test_simple_substitution():
+    """Test that ${name} and $name are replaced in one pass without Jinja2."""
+    variables = {"name": "API", "name_v2": "API v2", "rate": 100, "path": "C:\\specs", "a.b": "dotted"}
+    content = "${name} $name_v2 $names $name, ${rate}/s at $path ${a.b} $a.b $missing ${missing} $"
+    assert substitute_variables(content, variables) == (
+        "API API v2 $names API, 100/s at C:\\specs dotted dotted $missing ${missing} $")
+    assert substitute_variables("$x and $y", {"x": "$y", "y": "1"}) == "$y and 1"
+    assert MSLRenderer()._render_simple("# ${title}", {"title": "Spec"}) == "# Spec"
+    assert substitute_variables("$name", {}) == "$name"
+    assert substitute_variables("a ${} b $ c $name", {"": "E", "name": "N"}) == "a E b $ c N"
+    assert substitute_variables("a ${} b $ c", {"": "E"}) == "a E b $ c"
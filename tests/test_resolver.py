@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""Test spec lookup and inheritance resolution."""
+
+import os
+import pickle
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+import pytest
+
+from lib.cache import ParseCache
+from lib.resolver import MSLResolver
+
+
+def write_spec(path, spec_id=None, extends=None, requirements=("REQ-001: Base requirement",)):
+    """Write a small spec file, creating parent directories."""
+    frontmatter = []
+    if spec_id:
+        frontmatter.append(f"id: {spec_id}")
+    if extends:
+        frontmatter.append(f"extends: {extends}")
+    header = "---\n" + "\n".join(frontmatter) + "\n---\n" if frontmatter else ""
+    body = "\n".join(f"- {req}" for req in requirements)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"{header}# {path.stem}\n\n## Requirements\n\n{body}\n")
+
+
+def touch_dir(path):
+    """Move a directory's mtime forward so the change is seen on coarse clocks."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_index_lookup_order(temp_dir):
+    """Test that the original probe locations win over frontmatter IDs and nested files."""
+    write_spec(temp_dir / "templates" / "base.md")
+    write_spec(temp_dir / "specs" / "base.md")
+    write_spec(temp_dir / "nested" / "declared.md", spec_id="payments")
+    write_spec(temp_dir / "nested" / "deep" / "auth.msl")
+    index = MSLResolver(str(temp_dir)).index
+
+    assert index.find("base") == temp_dir / "specs" / "base.md"
+    assert index.find("payments") == temp_dir / "nested" / "declared.md"
+    assert index.find("nested/declared") == temp_dir / "nested" / "declared.md"
+    assert index.find("auth") == temp_dir / "nested" / "deep" / "auth.msl"
+
+    write_spec(temp_dir / "base.msl")
+    touch_dir(temp_dir)
+    assert index.refresh()
+    assert index.find("base") == temp_dir / "base.msl"
+
+
+def test_index_refresh_and_negative_cache(temp_dir, monkeypatch):
+    """Test that misses are cached and new or removed files are picked up."""
+    write_spec(temp_dir / "child.md", extends="parent")
+    resolver = MSLResolver(str(temp_dir))
+    with pytest.raises(FileNotFoundError):
+        resolver.resolve("child")
+
+    # A repeated miss only checks directory mtimes
+    probes = []
+    monkeypatch.setattr(resolver.index, "_probe", lambda spec_id: probes.append(spec_id))
+    assert resolver.index.find("parent") is None
+    assert probes == []
+    monkeypatch.undo()
+
+    write_spec(temp_dir / "specs" / "parent.md", requirements=("REQ-000: Inherited",))
+    touch_dir(temp_dir)
+    resolved = resolver.resolve("child")
+    assert sorted(req["id"] for req in resolved["requirements"]) == ["REQ-000", "REQ-001"]
+
+    (temp_dir / "specs" / "parent.md").unlink()
+    write_spec(temp_dir / "templates" / "parent.md")
+    for directory in ("specs", "templates"):
+        touch_dir(temp_dir / directory)
+    assert resolver.index.refresh()
+    assert resolver.index.find("parent") == temp_dir / "templates" / "parent.md"
+
+
+def test_resolve_reports_cycles(temp_dir):
+    """Test that circular inheritance names the cycle instead of recursing."""
+    write_spec(temp_dir / "app.md", extends="a")
+    write_spec(temp_dir / "a.md", extends="b")
+    write_spec(temp_dir / "b.md", extends="c")
+    write_spec(temp_dir / "c.md", extends="a")
+    resolver = MSLResolver(str(temp_dir))
+
+    with pytest.raises(ValueError, match="Circular inheritance: a -> b -> c -> a"):
+        resolver.resolve("app")
+    assert resolver._cache == {}
+
+
+def test_resolve_deep_chain(temp_dir):
+    """Test that chains deeper than the recursion limit resolve."""
+    depth = sys.getrecursionlimit() + 100
+    write_spec(temp_dir / "s0.md", requirements=("REQ-0: Root requirement",))
+    for i in range(1, depth):
+        write_spec(temp_dir / f"s{i}.md", extends=f"s{i - 1}", requirements=(f"REQ-{i}: Level {i}",))
+    resolver = MSLResolver(str(temp_dir))
+
+    resolved = resolver.resolve(f"s{depth - 1}")
+    assert len(resolved["requirements"]) == depth
+    assert len(resolver.resolve("s1")["requirements"]) == 2
+
+
+def test_resolve_cache_follows_ancestors(temp_dir, monkeypatch):
+    """Test that cached results persist and are dropped when an ancestor changes."""
+    write_spec(temp_dir / "root.md", requirements=("REQ-001: Original",))
+    write_spec(temp_dir / "middle.md", extends="root", requirements=("REQ-002: Middle",))
+    write_spec(temp_dir / "leaf.md", extends="middle", requirements=("REQ-003: Leaf",))
+    cache = ParseCache(str(temp_dir / ".cache"))
+    first = MSLResolver(str(temp_dir), cache=cache).resolve("leaf")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parsed despite a cache hit")
+
+    resolver = MSLResolver(str(temp_dir), cache=cache, max_entries=2)
+    monkeypatch.setattr(resolver.parser, "_parse_text", fail)
+    assert resolver.resolve("leaf") == first
+    monkeypatch.undo()
+
+    write_spec(temp_dir / "root.md", requirements=("REQ-001: Changed",))
+    stat = os.stat(temp_dir / "root.md")
+    os.utime(temp_dir / "root.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    resolved = resolver.resolve("leaf")
+    texts = {req["id"]: req["text"] for req in resolved["requirements"]}
+    assert texts == {"REQ-001": "Changed", "REQ-002": "Middle", "REQ-003": "Leaf"}
+    assert len(resolver._cache) == 2
+
+
+def test_merge_shares_untouched_requirements(temp_dir):
+    """Test that inherited requirements are shared and only changed ones are new."""
+    write_spec(temp_dir / "base.md", requirements=[f"REQ-{i:03d}: Base {i}" for i in range(50)])
+    write_spec(temp_dir / "mid.md", extends="base", requirements=("REQ-001: [!] Tightened", "REQ-100: [NEW] Added"))
+    write_spec(temp_dir / "app.md", extends="mid", requirements=("REQ-002: [OVERRIDE] Replaced",))
+    resolver = MSLResolver(str(temp_dir))
+    base = {req["id"]: req for req in resolver.resolve("base")["requirements"]}
+    app = resolver.resolve("app")["requirements"]
+
+    assert len(app) == 51
+    assert [req["id"] for req in app[:4]] == ["REQ-002", "REQ-001", "REQ-100", "REQ-000"]
+    by_id = {req["id"]: req for req in app}
+    assert by_id["REQ-001"]["priority"] == "critical" and by_id["REQ-001"] is not base["REQ-001"]
+    assert by_id["REQ-002"]["text"] == "Replaced"
+    assert all(by_id[req_id] is req for req_id, req in base.items() if req_id not in ("REQ-001", "REQ-002"))
+    assert app == list(app) and isinstance(pickle.loads(pickle.dumps(app)), list)
+
+
+def test_merge_matches_nested_requirements(temp_dir):
+    """Test that overrides of nested requirements apply in place instead of duplicating them."""
+    (temp_dir / "base.md").write_text("""# Base
+## Requirements
+- REQ-001: Auth
+  - REQ-001.1: Login
+  - REQ-001.2: Sessions
+    - REQ-001.2.1: Timeout after 30 minutes
+    - REQ-001.2.2: Rotate keys
+- REQ-002: Logging
+""")
+    (temp_dir / "app.md").write_text("""---
+extends: base
+---
+# App
+## Requirements
+- REQ-001.2.1: [OVERRIDE] Timeout after 5 minutes
+- REQ-002: [!] Logging everywhere
+""")
+    (temp_dir / "tenant.md").write_text("""---
+extends: app
+---
+# Tenant
+## Requirements
+- REQ-001.2: Sessions in Redis
+  - REQ-001.2.2: [OVERRIDE] Rotate keys daily
+  - REQ-001.2.3: [NEW] Revoke on logout
+""")
+    resolver = MSLResolver(str(temp_dir))
+
+    def outline(reqs):
+        return [(req["id"], req["text"], outline(req["children"])) for req in reqs]
+
+    app = resolver.resolve("app")["requirements"]
+    assert [req["id"] for req in app] == ["REQ-002", "REQ-001"]
+    assert outline(app[1]["children"][1:]) == [("REQ-001.2", "Sessions", [
+        ("REQ-001.2.1", "Timeout after 5 minutes", []),
+        ("REQ-001.2.2", "Rotate keys", []),
+    ])]
+    base = resolver.resolve("base")["requirements"]
+    assert app[1]["children"][0] is base[0]["children"][0]
+
+    tenant = resolver.resolve("tenant")["requirements"]
+    sessions = tenant[1]["children"][1]
+    assert (sessions["text"], sessions["depth"], sessions["parent_id"]) == ("Sessions in Redis", 1, "REQ-001")
+    assert outline(sessions["children"]) == [
+        ("REQ-001.2.2", "Rotate keys daily", []),
+        ("REQ-001.2.3", "Revoke on logout", []),
+        ("REQ-001.2.1", "Timeout after 5 minutes", []),
+    ]
+    assert [(req["depth"], req["parent_id"]) for req in sessions["children"]] == [(2, "REQ-001.2")] * 3
+    assert sum(1 for req in tenant for _ in req.walk()) == 7
+
+
+def test_merge_override_replaces_subtree(temp_dir):
+    """Test that an overridden requirement keeps only the children it restates."""
+    (temp_dir / "base.md").write_text("""# Base
+## Requirements
+- REQ-001: Auth
+  - REQ-001.1: Login
+  - REQ-001.2: Sessions
+    - REQ-001.2.1: Timeout
+- REQ-002: Logging
+""")
+    (temp_dir / "app.md").write_text("""---
+extends: base
+---
+# App
+## Requirements
+- REQ-001: [OVERRIDE] Auth via SSO
+- REQ-002: [OVERRIDE] Structured logging
+  - REQ-002.1: JSON lines
+""")
+    resolver = MSLResolver(str(temp_dir))
+    app = {req["id"]: req for req in resolver.resolve("app")["requirements"]}
+
+    assert app["REQ-001"]["text"] == "Auth via SSO" and app["REQ-001"]["children"] == []
+    assert [child["id"] for child in app["REQ-002"]["children"]] == ["REQ-002.1"]
+    assert [req["id"] for req in app["REQ-001"].walk()] == ["REQ-001"]
+    base = resolver.resolve("base")["requirements"]
+    assert [child["id"] for child in base[0]["children"]] == ["REQ-001.1", "REQ-001.2"]
+
+
+def test_resolve_all_in_topological_order(temp_dir, monkeypatch):
+    """Test that resolve_all parses shared ancestors once and yields parents first."""
+    write_spec(temp_dir / "templates" / "rest-api-base.md", requirements=("REQ-001: Versioned URLs",))
+    write_spec(temp_dir / "payments.md", extends="rest-api-base", requirements=("REQ-002: Idempotency keys",))
+    write_spec(temp_dir / "refunds.md", extends="payments", requirements=("REQ-003: Partial refunds",))
+    write_spec(temp_dir / "users.md", extends="rest-api-base", requirements=("REQ-004: Pagination",))
+    write_spec(temp_dir / "orphan.md", extends="missing")
+    write_spec(temp_dir / "loop-a.md", extends="loop-b")
+    write_spec(temp_dir / "loop-b.md", extends="loop-a")
+    paths = [str(temp_dir / name) for name in
+             ("refunds.md", "loop-a.md", "users.md", "orphan.md", "payments.md", "templates/rest-api-base.md")]
+
+    resolver = MSLResolver(str(temp_dir))
+    parsed = []
+    parse_content = resolver.parser.parse_content
+    monkeypatch.setattr(resolver.parser, "parse_content",
+                        lambda content, source: parsed.append(source) or parse_content(content, source))
+    results = list(resolver.resolve_all(paths))
+
+    names = [Path(path).name for path, _, _ in results]
+    assert names == ["rest-api-base.md", "orphan.md", "payments.md", "users.md", "refunds.md", "loop-a.md"]
+    assert sorted(Path(source).name for source in parsed) == sorted(names[:1] + names[2:5])
+    errors = {Path(path).name: str(error) for path, _, error in results if error is not None}
+    assert errors == {"orphan.md": "Specification not found: missing",
+                      "loop-a.md": "Circular inheritance: loop-a -> loop-b -> loop-a"}
+
+    fresh = MSLResolver(str(temp_dir))
+    with pytest.raises(ValueError, match=errors["loop-a.md"]):
+        fresh.resolve("loop-a")
+    for path, resolved, error in results:
+        if error is None:
+            assert resolved == fresh.resolve(Path(path).stem)
+
+
+def test_dependents_follow_changes(temp_dir):
+    """Test that descendants are found through the reverse index and kept up to date."""
+    write_spec(temp_dir / "templates" / "rest-api-base.md")
+    write_spec(temp_dir / "payments.md", extends="rest-api-base")
+    write_spec(temp_dir / "specs" / "refunds.md", extends="payments")
+    write_spec(temp_dir / "users.md", extends="rest-api-base")
+    write_spec(temp_dir / "standalone.md")
+    resolver = MSLResolver(str(temp_dir))
+    base = str(temp_dir / "templates" / "rest-api-base.md")
+
+    def names(paths):
+        return [Path(path).relative_to(temp_dir).as_posix() for path in paths]
+
+    assert names(resolver.dependents("rest-api-base")) == ["payments.md", "users.md", "specs/refunds.md"]
+    assert names(resolver.dependents(base, transitive=False)) == ["payments.md", "users.md"]
+    assert resolver.dependents("standalone") == []
+
+    write_spec(temp_dir / "users.md", extends="payments")
+    stat = os.stat(temp_dir / "users.md")
+    os.utime(temp_dir / "users.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    (temp_dir / "specs" / "refunds.md").unlink()
+    write_spec(temp_dir / "specs" / "chargebacks.md", extends="payments")
+    touch_dir(temp_dir / "specs")
+    assert names(resolver.dependents("payments")) == ["specs/chargebacks.md", "users.md"]
+    assert names(resolver.dependents("rest-api-base")) == ["payments.md", "specs/chargebacks.md", "users.md"]
+
+
+def test_lazy_resolve_merges_fields_when_read(temp_dir, monkeypatch):
+    """Test that lazy views read metadata from frontmatter alone and match eager results."""
+    write_spec(temp_dir / "base.md", spec_id="base", requirements=("REQ-001: Auth", "  - REQ-001.1: Login"))
+    (temp_dir / "app.md").write_text("""---
+extends: base
+status: active
+---
+## Requirements
+- REQ-001.1: [OVERRIDE] Login with SSO
+- REQ-002: [NEW] Audit log
+""")
+    resolver = MSLResolver(str(temp_dir))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("body parsed for a metadata read")
+
+    monkeypatch.setattr(resolver.parser, "_tokenize", fail)
+    view = resolver.resolve("app", lazy=True)
+    assert (view["metadata"]["status"], view["metadata"]["id"]) == ("active", "app")
+    assert view["source"] == str(temp_dir / "base.md")
+    monkeypatch.undo()
+
+    assert view.requirement("REQ-001.1")["text"] == "Login with SSO"
+    assert view.requirement("REQ-404") is None
+    eager = MSLResolver(str(temp_dir)).resolve("app")
+    assert dict(view) == eager and pickle.loads(pickle.dumps(view)) == eager
+
+    resolver.resolve("base")
+    monkeypatch.setattr(resolver.parser, "_parse_text", fail)
+    assert dict(resolver.resolve("app", lazy=True)) == eager
+
+
+def test_search_paths_from_mslrc(temp_dir):
+    """Test that search roots come from .mslrc and shadow each other in order."""
+    app = temp_dir / "services" / "app"
+    write_spec(app / "checkout.md", extends="rest-api-base", requirements=("REQ-010: Checkout",))
+    write_spec(app / "vendor" / "rest-api-base.md", requirements=("REQ-001: Stray copy",))
+    write_spec(temp_dir / "packages" / "shared" / "templates" / "rest-api-base.md",
+               requirements=("REQ-001: Shared",))
+    write_spec(temp_dir / "packages" / "api" / "templates" / "rest-api-base.md",
+               requirements=("REQ-001: Shadowed",))
+    write_spec(temp_dir / "packages" / "api" / "audit.md", spec_id="audit-log")
+    (temp_dir / ".mslrc").write_text("resolver:\n  search_paths:\n    - packages/shared\n    - packages/api\n")
+    resolver = MSLResolver(str(app))
+
+    assert resolver.search_paths == [str(temp_dir / "packages" / "shared"), str(temp_dir / "packages" / "api")]
+    resolved = resolver.resolve("checkout")
+    assert [req["text"] for req in resolved["requirements"]] == ["Checkout", "Shared"]
+    assert resolver.index.find("audit-log") == temp_dir / "packages" / "api" / "audit.md"
+    assert resolver.index.find("vendor/rest-api-base") == app / "vendor" / "rest-api-base.md"
+    assert MSLResolver(str(app), search_paths=[]).index.find("rest-api-base") == app / "vendor" / "rest-api-base.md"
+
+
+def test_search_path_inside_relative_base(temp_dir, monkeypatch):
+    """Test that a search root inside the base path is one tree, spelled like the base path."""
+    shared = temp_dir / "packages" / "shared" / "templates" / "rest-api-base.md"
+    write_spec(shared, requirements=("REQ-001: Shared",))
+    write_spec(temp_dir / "app.md", extends="rest-api-base", requirements=("REQ-010: App",))
+    (temp_dir / ".mslrc").write_text("resolver:\n  search_paths:\n    - packages/shared\n")
+    monkeypatch.chdir(temp_dir)
+    resolver = MSLResolver(".")
+
+    assert resolver.index._roots == [".", os.path.join("packages", "shared")]
+    paths = resolver.index.paths()
+    assert sorted(paths) == sorted([os.path.join("packages", "shared", "templates", "rest-api-base.md"), "app.md"])
+    assert resolver.index.find("rest-api-base") == Path("packages/shared/templates/rest-api-base.md")
+    assert resolver.resolve("app")["source"] == os.path.join("packages", "shared", "templates", "rest-api-base.md")
+    assert resolver.dependents("packages/shared/templates/rest-api-base.md") == ["app.md"]
+    assert resolver.dependents(str(shared)) == ["app.md"]
+    [(_, resolved, error)] = resolver.resolve_all([str(temp_dir / "app.md")])
+    assert error is None and resolved is resolver.resolve("app")
@@ -177,6 +177,32 @@ def test_forbidden_markers_validation():
     assert len(forbidden_issues) == 2
     
 
+def test_issue_positions():
+    """Test that requirement issues carry the line and column of their source."""
+    parser = MSLParser()
+    
+    content = """# Test Spec
+
+## Requirements
+- REQ-001: First
+  - REQ-001.1: Child
+    - REQ-002.5: Misplaced grandchild
+- REQ-001: [deprecated] Duplicate
+- REQ-003: [stage:nowhere] Unknown stage
+"""
+    
+    parsed = parser.parse_content(content)
+    validator = MSLValidator(config=ValidationConfig(forbid_markers=['deprecated']))
+    
+    positions = {i.message.split(':')[0]: (i.line, i.column) for i in validator.validate(parsed)}
+    
+    assert positions["Duplicate requirement ID"] == (7, 1)
+    assert positions["Requirement REQ-001 uses forbidden marker"] == (7, 12)
+    assert positions["Invalid stage in REQ-003"] == (8, 12)
+    assert positions["Child requirement REQ-002.5 doesn't follow parent ID pattern REQ-001.1.N"] == (6, 5)
+    
+
+
 
 def test_id_format_validation():
     """Test custom ID format validation."""
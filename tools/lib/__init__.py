@@ -6,5 +6,8 @@ from .parser import MSLParser
 from .validator import MSLValidator
 from .resolver import MSLResolver
 from .renderer import MSLRenderer
+from .markers import MarkerGrammar
+from .requirement import Requirement
+from .cache import ParseCache
 
-__all__ = ["MSLParser", "MSLValidator", "MSLResolver", "MSLRenderer"]
\ No newline at end of file
+__all__ = ["MSLParser", "MSLValidator", "MSLResolver", "MSLRenderer", "MarkerGrammar", "Requirement", "ParseCache"]
\ No newline at end of file
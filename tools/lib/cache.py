@@ -0,0 +1,132 @@
+"""MSL Cache - Persistent, content-addressed cache of parse results."""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+class ParseCache:
+    """On-disk cache of parse results keyed by file content.
+
+    Entries are pickled, zlib-compressed and written to a temporary file that
+    is then renamed into place, so several processes (e.g. parallel CI jobs)
+    can share one directory. When the directory grows past ``max_bytes`` the
+    least recently used entries are removed.
+
+    Entries are unpickled on load, so only point this at a directory you trust.
+    """
+
+    SUFFIX = ".pkl.z"
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size = None
+
+    def key(self, data: bytes, source: str, version: str = "") -> str:
+        """Return the cache key for ``data`` parsed from ``source``.
+
+        ``version`` should change whenever the parser output for the same input
+        can change.
+        """
+        digest = hashlib.sha256()
+        for part in (version.encode('utf-8'), source.encode('utf-8'), data):
+            digest.update(len(part).to_bytes(8, 'little'))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for ``key``, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                blob = f.read()
+            result = pickle.loads(zlib.decompress(blob))
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Unreadable or stale entry, treat as a miss
+            self._remove(path)
+            return None
+
+        # Hits count as use for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """Store a result. Failures to write are ignored."""
+        blob = zlib.compress(pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(blob)
+                os.replace(temp_path, self._path(key))
+            except BaseException:
+                self._remove(Path(temp_path))
+                raise
+        except OSError:
+            return
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += len(blob)
+        if self._size > self.max_bytes:
+            self.prune()
+
+    def size(self) -> int:
+        """Return the total size of all entries in bytes."""
+        return sum(size for _, _, size in self._entries())
+
+    def prune(self, target: Optional[int] = None):
+        """Remove least recently used entries until at most ``target`` bytes remain.
+
+        Defaults to three quarters of ``max_bytes`` so that pruning does not run
+        again on every new entry.
+        """
+        if target is None:
+            target = self.max_bytes * 3 // 4
+
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+        self._size = total
+
+    def clear(self):
+        """Remove every entry."""
+        self.prune(0)
+
+    def _entries(self):
+        """Yield (mtime, path, size) for each entry in the directory."""
+        try:
+            paths = list(self.directory.glob(f"*{self.SUFFIX}"))
+        except OSError:
+            return
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            yield stat.st_mtime, path, stat.st_size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    def _remove(self, path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -176,7 +176,7 @@ class CodeScanner:
         from .parser import MSLParser
         
         # Parse spec file to get requirements
-        parser = MSLParser()
+        parser = MSLParser(keep_raw_content=False)
         parsed = parser.parse_file(spec_file)
         requirements = parsed.get('requirements', [])
         
@@ -242,7 +242,7 @@ class CodeScanner:
         """Verify bidirectional links between spec and code."""
         from .parser import MSLParser
         
-        parser = MSLParser()
+        parser = MSLParser(keep_raw_content=False)
         parsed = parser.parse_file(spec_file)
         requirements = parsed.get('requirements', [])
         
@@ -0,0 +1,514 @@
+"""MSL Compiled - Binary spec format that loads without parsing."""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, List, Optional
+
+import yaml
+
+from .frontmatter import YAMLLoader
+from .requirement import CONTAINERS, FIELDS, MISSING, Requirement
+
+try:
+    from yaml import CSafeDumper as YAMLDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as YAMLDumper
+
+
+MAGIC = b"MSLC"
+FORMAT_VERSION = 1
+SUFFIX = ".mslc"
+
+# String references at or above these do not index the string table
+NONE = 0xFFFFFFFF
+ABSENT = 0xFFFFFFFE     # the key is missing from the requirement
+
+# Sentinels for the other column types
+LEVEL_NONE = -2 ** 31 + 1
+LEVEL_ABSENT = -2 ** 31
+ENUM_ABSENT = 0xFF
+
+# Fields coded as small integers into one per-file table of distinct values
+ENUMS = ("priority", "status", "inheritance")
+
+# Fields stored as string references
+STRING_FIELDS = ("text", "id", "assignee", "original_text", "parent_ref", "parent_id")
+
+# Per-requirement columns in file order, with their array typecodes. Rows are
+# in document order (depth first), so a subtree is rows index to end - 1.
+COLUMNS = STRING_FIELDS + ("extra", "hierarchy_level", "depth", "parent", "end",
+                           "line", "column", "marker_column") + ENUMS
+TYPECODES = dict.fromkeys(COLUMNS, "I")
+TYPECODES.update({"hierarchy_level": "i", "parent": "i"})
+TYPECODES.update(dict.fromkeys(ENUMS, "B"))
+
+# Document fields stored as string references
+DOCUMENT_STRINGS = ("source", "metadata", "title", "summary", "notes", "sections")
+
+# magic, format version, reserved, level, requirement, root, string and enum
+# value counts, then the document string references
+HEADER = struct.Struct("<4sHHiIIII" + "I" * len(DOCUMENT_STRINGS))
+
+# Requirement keys kept in the per-requirement JSON "extra" string
+JSON_FIELDS = ("tags", "markers", "categories", "metrics", "code_links")
+
+_FIELD_SET = frozenset(FIELDS)
+
+
+def compile_document(parsed: Dict[str, Any]) -> bytes:
+    """Serialize a parse result to the compiled format.
+
+    ``raw_content`` is not stored. Raises ValueError for values the format
+    cannot hold, such as metadata YAML cannot represent or marker values that
+    do not survive a JSON round trip.
+    """
+    strings = _StringTable()
+    enum_codes: Dict[Any, int] = {}
+    enum_values = array("I")
+    columns = {name: array(TYPECODES[name]) for name in COLUMNS}
+    roots = array("I")
+
+    # Rows are written in document order; children are pushed in reverse
+    stack = [(root, -1) for root in reversed(parsed.get("requirements") or [])]
+    while stack:
+        req, parent = stack.pop()
+        index = len(columns["parent"])
+        if parent == -1:
+            roots.append(index)
+        label = req.get("id") or f"requirement {index + 1}"
+
+        for name in STRING_FIELDS:
+            columns[name].append(strings.add(req.get(name, MISSING), f"{name} of {label}"))
+        for name in ENUMS:
+            value = req.get(name, MISSING)
+            if value is MISSING:
+                columns[name].append(ENUM_ABSENT)
+                continue
+            code = enum_codes.get(value)
+            if code is None:
+                if len(enum_values) == ENUM_ABSENT:
+                    raise ValueError(f"Too many distinct {', '.join(ENUMS)} values to compile")
+                code = enum_codes[value] = len(enum_values)
+                enum_values.append(strings.add(value, f"{name} of {label}"))
+            columns[name].append(code)
+
+        level = req.get("hierarchy_level", MISSING)
+        columns["hierarchy_level"].append(
+            LEVEL_ABSENT if level is MISSING else LEVEL_NONE if level is None else _int(level, label))
+        columns["depth"].append(_int(req.get("depth", 0), label))
+        columns["parent"].append(parent)
+        columns["end"].append(0)
+        for name in ("line", "column", "marker_column"):
+            columns[name].append(_int(getattr(req, name, None) or 0, label))
+        columns["extra"].append(strings.add(_extra_json(req, label), f"markers of {label}"))
+
+        children = req.get("children") or []
+        stack.extend((child, index) for child in reversed(children))
+
+    # A row's subtree ends where the next row outside it starts
+    parents = columns["parent"]
+    sizes = [1] * len(parents)
+    for index in range(len(parents) - 1, 0, -1):
+        if parents[index] != -1:
+            sizes[parents[index]] += sizes[index]
+    columns["end"] = array("I", (index + size for index, size in enumerate(sizes)))
+
+    document = [strings.add(parsed.get("source"), "source"),
+                strings.add(_metadata_yaml(parsed.get("metadata")), "metadata")]
+    for name in ("title", "summary", "notes"):
+        document.append(strings.add(parsed.get(name), name))
+    sections = parsed.get("sections")
+    document.append(NONE if sections is None else strings.add(json.dumps(sections), "sections"))
+
+    level = parsed.get("level", 0)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, _int(level, "level"), len(parents),
+                         len(roots), len(strings.offsets) - 1, len(enum_values), *document)
+
+    parts = [header + bytes(-len(header) % 8)]
+    size = len(parts[0])
+    for part in [enum_values, strings.offsets] + [columns[name] for name in COLUMNS] + [roots]:
+        data = _to_bytes(part)
+        parts.append(data + bytes(-len(data) % 8))
+        size += len(parts[-1])
+    blob = b"".join(strings.parts)
+    if size + len(blob) >= NONE:
+        raise ValueError("Document is too large to compile")
+    parts.append(blob)
+    return b"".join(parts)
+
+
+def write_compiled(parsed: Dict[str, Any], path: str):
+    """Compile a parse result to ``path``.
+
+    The file is written next to its destination and renamed into place, so
+    processes that have the old version mapped keep reading it unchanged.
+    """
+    data = compile_document(parsed)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_compiled(path: str) -> "CompiledSpec":
+    """Open a compiled spec written by ``write_compiled``."""
+    return CompiledSpec(path)
+
+
+class CompiledSpec(Mapping):
+    """Read-only parse result backed by a memory-mapped ``.mslc`` file.
+
+    Opening the file only reads its header; every column is a ``memoryview``
+    over the mapping, so strings, metadata and marker values are decoded when
+    they are accessed. Requirements are ``CompiledRequirement`` views.
+
+    Keys and values match the parse result the file was compiled from, except
+    that ``raw_content`` is always None. Use ``to_dict()`` for a mutable copy.
+    Views must not be used after ``close()``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Not a compiled MSL spec: {path}") from None
+        self._views = []
+        try:
+            self._open()
+        except Exception:
+            self.close()
+            raise
+        self._metadata = MISSING
+        self._requirements = None
+        self._enum_cache = [MISSING] * len(self._enums)
+
+    def _open(self):
+        view = self._view(memoryview(self._mmap))
+        if len(view) < HEADER.size:
+            raise ValueError(f"Not a compiled MSL spec: {self.path}")
+        (magic, version, _, self._level, count, root_count, string_count, enum_count,
+         *document) = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"Not a compiled MSL spec: {self.path}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled spec version {version}: {self.path}")
+        self._document = dict(zip(DOCUMENT_STRINGS, document))
+
+        position = HEADER.size + (-HEADER.size % 8)
+
+        def take(typecode, length):
+            nonlocal position
+            size = length * array(typecode).itemsize
+            column = self._cast(view[position:position + size], typecode)
+            position += size + (-size % 8)
+            return column
+
+        self._enums = take("I", enum_count)
+        self._offsets = take("I", string_count + 1)
+        self._columns = {name: take(TYPECODES[name], count) for name in COLUMNS}
+        self._roots = take("I", root_count)
+        self._blob = self._view(view[position:])
+        if len(self._blob) < self._offsets[-1]:
+            raise ValueError(f"Truncated compiled spec: {self.path}")
+
+    def close(self):
+        """Release the memory map."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "level":
+            return self._level
+        if key == "metadata":
+            if self._metadata is MISSING:
+                text = self._string(self._document["metadata"])
+                self._metadata = None if text is None else yaml.load(text, Loader=YAMLLoader)
+            return self._metadata
+        if key == "requirements":
+            if self._requirements is None:
+                self._requirements = [CompiledRequirement(self, index) for index in self._roots]
+            return self._requirements
+        if key == "sections":
+            text = self._string(self._document["sections"])
+            if text is None:
+                return None
+            return {name: tuple(span) for name, span in json.loads(text).items()}
+        if key == "raw_content":
+            return None
+        if key in self._document:
+            return self._string(self._document[key])
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(("source", "level", "metadata", "title", "summary", "requirements",
+                     "notes", "sections", "raw_content"))
+
+    def __len__(self) -> int:
+        return 9
+
+    def __repr__(self):
+        return f"CompiledSpec({self.path!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Decode everything into a parse result with ``Requirement`` objects."""
+        result = dict(self)
+        result["requirements"] = [req.to_requirement() for req in self["requirements"]]
+        return result
+
+    def _view(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+
+    def _cast(self, view: memoryview, typecode: str):
+        """Return a column of ``typecode`` values over ``view``."""
+        if sys.byteorder == "little":
+            return self._view(self._view(view).cast(typecode))
+        # The file is little-endian; big-endian hosts pay for one copy
+        column = array(typecode, bytes(view))
+        column.byteswap()
+        return column
+
+    def _string(self, ref: int) -> Any:
+        if ref >= ABSENT:
+            return None if ref == NONE else MISSING
+        offsets = self._offsets
+        return str(self._blob[offsets[ref]:offsets[ref + 1]], "utf-8")
+
+    def _enum(self, code: int) -> Any:
+        if code == ENUM_ABSENT:
+            return MISSING
+        value = self._enum_cache[code]
+        if value is MISSING:
+            value = self._enum_cache[code] = self._string(self._enums[code])
+        return value
+
+
+class CompiledRequirement(Mapping):
+    """Read-only view of one requirement row in a ``CompiledSpec``.
+
+    Compares equal to the ``Requirement`` it was compiled from. Containers are
+    decoded into new objects on every access, so changing them has no
+    effect; use ``to_requirement()`` for an editable copy of the subtree.
+    """
+
+    __slots__ = ("_spec", "_index", "_extra")
+
+    def __init__(self, spec: CompiledSpec, index: int):
+        self._spec = spec
+        self._index = index
+        self._extra = None
+
+    @property
+    def line(self) -> Optional[int]:
+        return self._spec._columns["line"][self._index] or None
+
+    @property
+    def column(self) -> Optional[int]:
+        return self._spec._columns["column"][self._index] or None
+
+    @property
+    def marker_column(self) -> Optional[int]:
+        return self._spec._columns["marker_column"][self._index] or None
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._value(key)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return self._value(key) is not MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if self._value(key) is not MISSING:
+                yield key
+        yield from self._extras().get("extra", ())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"CompiledRequirement({dict(self)!r})"
+
+    def walk(self) -> Iterator["CompiledRequirement"]:
+        """Yield this requirement and all of its descendants, depth first."""
+        spec = self._spec
+        for index in range(self._index, spec._columns["end"][self._index]):
+            yield CompiledRequirement(spec, index)
+
+    def to_requirement(self) -> Requirement:
+        """Decode this subtree into ``Requirement`` objects."""
+        spec = self._spec
+        columns = spec._columns
+        parents = columns["parent"]
+        built = {}
+
+        # Slots are filled directly, MISSING included, as decoding key by key
+        # through the mapping interface is several times slower
+        for index in range(self._index, columns["end"][self._index]):
+            req = Requirement.__new__(Requirement)
+            for name in STRING_FIELDS:
+                setattr(req, name, spec._string(columns[name][index]))
+            for name in ENUMS:
+                setattr(req, name, spec._enum(columns[name][index]))
+            level = columns["hierarchy_level"][index]
+            req.hierarchy_level = (MISSING if level == LEVEL_ABSENT else
+                                   None if level == LEVEL_NONE else level)
+            req.depth = columns["depth"][index]
+            req.line = columns["line"][index] or None
+            req.column = columns["column"][index] or None
+            req.marker_column = columns["marker_column"][index] or None
+
+            text = spec._string(columns["extra"][index])
+            extras = json.loads(text) if text is not None else {}
+            req._tags, req._markers, req._categories, req._metrics, req._children = (
+                MISSING if key in extras and extras[key] is None else extras.get(key)
+                for key in ("tags", "markers", "categories", "metrics", "children"))
+            req.code_links = extras.get("code_links", MISSING)
+            req._extra = extras.get("extra")
+
+            if built:
+                built[parents[index]]["children"].append(req)
+            built[index] = req
+        return built[self._index]
+
+    def _value(self, key: Any) -> Any:
+        """Decode one field, returning MISSING when the requirement lacks it."""
+        spec = self._spec
+        index = self._index
+        if key in STRING_FIELDS:
+            return spec._string(spec._columns[key][index])
+        if key in ENUMS:
+            return spec._enum(spec._columns[key][index])
+        if key == "hierarchy_level":
+            level = spec._columns[key][index]
+            return MISSING if level == LEVEL_ABSENT else None if level == LEVEL_NONE else level
+        if key == "depth":
+            return spec._columns[key][index]
+
+        extras = self._extras()
+        if key in CONTAINERS:
+            if key in extras:
+                return MISSING if extras[key] is None else extras[key]
+            if key == "children":
+                return self._children()
+            return CONTAINERS[key]()
+        if key == "code_links":
+            return extras.get(key, MISSING)
+        return extras.get("extra", {}).get(key, MISSING)
+
+    def _extras(self) -> Dict[str, Any]:
+        if self._extra is None:
+            text = self._spec._string(self._spec._columns["extra"][self._index])
+            self._extra = json.loads(text) if text is not None else {}
+        return self._extra
+
+    def _children(self) -> List["CompiledRequirement"]:
+        spec = self._spec
+        end = spec._columns["end"]
+        children = []
+        index = self._index + 1
+        while index < end[self._index]:
+            children.append(CompiledRequirement(spec, index))
+            index = end[index]
+        return children
+
+
+class _StringTable:
+    """Deduplicated UTF-8 strings and their offsets into one blob."""
+
+    def __init__(self):
+        self.refs: Dict[str, int] = {}
+        self.parts: List[bytes] = []
+        self.offsets = array("I", [0])
+
+    def add(self, value: Any, what: str) -> int:
+        if value is None:
+            return NONE
+        if value is MISSING:
+            return ABSENT
+        if not isinstance(value, str):
+            raise ValueError(f"Cannot compile {what}: expected a string, got {type(value).__name__}")
+        ref = self.refs.get(value)
+        if ref is None:
+            data = value.encode("utf-8")
+            end = self.offsets[-1] + len(data)
+            if end >= ABSENT:
+                raise ValueError("Document is too large to compile")
+            ref = self.refs[value] = len(self.parts)
+            self.parts.append(data)
+            self.offsets.append(end)
+        return ref
+
+
+def _int(value: Any, what: str) -> int:
+    if type(value) is not int or not 0 <= value < 2 ** 31:
+        raise ValueError(f"Cannot compile {what}: unexpected number {value!r}")
+    return value
+
+
+def _extra_json(req: Mapping, label: str) -> Optional[str]:
+    """Encode container, code link and unknown fields that differ from the defaults."""
+    extra = {}
+    for key in JSON_FIELDS + ("children",):
+        value = req.get(key, MISSING)
+        if value is MISSING:
+            if key in CONTAINERS:
+                extra[key] = None
+        elif key not in CONTAINERS or (value and key != "children"):
+            extra[key] = value
+    unknown = {key: req[key] for key in req if key not in _FIELD_SET}
+    if unknown:
+        extra["extra"] = unknown
+    if not extra:
+        return None
+
+    text = json.dumps(extra, ensure_ascii=False, separators=(",", ":"))
+    if json.loads(text) != extra:
+        raise ValueError(f"Cannot compile {label}: marker values must survive a JSON round trip")
+    return text
+
+
+def _metadata_yaml(metadata: Any) -> Optional[str]:
+    """Encode metadata as YAML, which keeps the dates and other types it was loaded with."""
+    if metadata is None:
+        return None
+    try:
+        text = yaml.dump(metadata, Dumper=YAMLDumper, sort_keys=False, allow_unicode=True)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Cannot compile metadata: {e}") from None
+    if yaml.load(text, Loader=YAMLLoader) != metadata:
+        raise ValueError("Cannot compile metadata: it does not survive a YAML round trip")
+    return text
+
+
+def _to_bytes(column: array) -> bytes:
+    if sys.byteorder != "little" and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
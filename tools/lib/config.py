@@ -9,6 +9,31 @@ from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass, field
 
 
+def find_config_file(start_path: str = ".") -> Optional[Path]:
+    """Find the nearest .mslrc (or .mslrc.yaml/.mslrc.yml) upward from ``start_path``, then in the home directory."""
+    current_path = Path(start_path).resolve()
+    
+    # Search for .mslrc in current and parent directories
+    while current_path != current_path.parent:
+        config_file = current_path / ".mslrc"
+        if config_file.exists():
+            return config_file
+        
+        # Also check for .mslrc.yaml or .mslrc.yml
+        for ext in ['.yaml', '.yml']:
+            config_file = current_path / f".mslrc{ext}"
+            if config_file.exists():
+                return config_file
+        
+        current_path = current_path.parent
+    
+    # Check home directory
+    home_config = Path.home() / ".mslrc"
+    if home_config.exists():
+        return home_config
+    return None
+
+
 @dataclass
 class ValidationConfig:
     """Configuration for MSL validation."""
@@ -77,26 +102,9 @@ class ValidationConfig:
     @classmethod
     def find_config(cls, start_path: str = ".") -> 'ValidationConfig':
         """Find and load .mslrc configuration file."""
-        current_path = Path(start_path).resolve()
-        
-        # Search for .mslrc in current and parent directories
-        while current_path != current_path.parent:
-            config_file = current_path / ".mslrc"
-            if config_file.exists():
-                return cls.from_file(str(config_file))
-            
-            # Also check for .mslrc.yaml or .mslrc.yml
-            for ext in ['.yaml', '.yml']:
-                config_file = current_path / f".mslrc{ext}"
-                if config_file.exists():
-                    return cls.from_file(str(config_file))
-            
-            current_path = current_path.parent
-        
-        # Check home directory
-        home_config = Path.home() / ".mslrc"
-        if home_config.exists():
-            return cls.from_file(str(home_config))
+        config_file = find_config_file(start_path)
+        if config_file is not None:
+            return cls.from_file(str(config_file))
         
         # Return default config
         return cls()
@@ -125,6 +133,60 @@ class ValidationConfig:
         return result
 
 
+@dataclass
+class ResolverConfig:
+    """Configuration for finding specs, from the ``resolver`` section of .mslrc.
+    
+    ```yaml
+    resolver:
+      search_paths:
+        - packages/shared
+        - packages/api
+    ```
+    """
+    
+    # Directories searched after the base path, in order; relative paths in
+    # a config file are relative to the file
+    search_paths: List[str] = field(default_factory=list)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ResolverConfig':
+        """Create config from dictionary."""
+        search_paths = data.get('search_paths') or []
+        if isinstance(search_paths, str):
+            search_paths = [search_paths]
+        return cls(search_paths=[str(path) for path in search_paths])
+    
+    @classmethod
+    def from_yaml(cls, yaml_content: str) -> 'ResolverConfig':
+        """Create config from YAML string."""
+        data = yaml.safe_load(yaml_content) or {}
+        return cls.from_dict(data.get('resolver') or {})
+    
+    @classmethod
+    def from_file(cls, file_path: str) -> 'ResolverConfig':
+        """Load config from a .mslrc file."""
+        path = Path(file_path)
+        if not path.exists():
+            return cls()
+            
+        try:
+            config = cls.from_yaml(path.read_text(encoding='utf-8'))
+        except yaml.YAMLError:
+            return cls()
+        config.search_paths = [os.path.normpath(path.parent / search_path)
+                               for search_path in config.search_paths]
+        return config
+    
+    @classmethod
+    def find_config(cls, start_path: str = ".") -> 'ResolverConfig':
+        """Find and load the .mslrc configuration file that applies to ``start_path``."""
+        config_file = find_config_file(start_path)
+        if config_file is not None:
+            return cls.from_file(str(config_file))
+        return cls()
+
+
 class CustomValidators:
     """Registry for custom validation functions."""
     
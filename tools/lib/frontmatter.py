@@ -0,0 +1,155 @@
+"""MSL Frontmatter - Fast loading of YAML frontmatter."""
+
+import re
+from functools import lru_cache
+from typing import Any
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YAMLLoader
+
+
+# "key: value" with a plain key at the start of the line
+FLAT_LINE = re.compile(r'([A-Za-z_][\w-]*):(?:[ ]+(.*?))?[ ]*$')
+
+# Characters that give a plain scalar special meaning when they start it
+INDICATORS = frozenset('-?:,[]{}#&*!|>\'"%@`')
+
+# Characters YAML rejects outright; those documents go to the full loader
+NON_PRINTABLE = re.compile('[^\x09\x0A\x0D\x20-\x7E\x85\xA0-\uD7FF\uE000-\uFFFD\U00010000-\U0010FFFF]')
+
+# Tags whose scalars the safe constructor builds from the text alone
+SCALAR_TAGS = frozenset([
+    'tag:yaml.org,2002:str', 'tag:yaml.org,2002:int', 'tag:yaml.org,2002:float',
+    'tag:yaml.org,2002:bool', 'tag:yaml.org,2002:null', 'tag:yaml.org,2002:timestamp',
+])
+
+_scalar_loader = yaml.SafeLoader("")
+
+
+class _Unsupported(Exception):
+    """The frontmatter uses YAML beyond the flat subset."""
+
+
+def load_frontmatter(text: str) -> Any:
+    """Load frontmatter YAML, returning what ``yaml.safe_load`` would.
+
+    ``key: value`` lines with plain or simply quoted scalars, ``[a, b]`` lists
+    and one level of nested ``key:`` blocks (a mapping, or a list of scalars
+    or single-key mappings) are read directly. Scalars are still resolved and
+    built by PyYAML, so ``1``, ``true``, ``~`` and dates keep their YAML types.
+    Anything else goes to the libyaml loader when it is available, or the
+    pure-Python one otherwise.
+    """
+    try:
+        return _load_simple(text)
+    except _Unsupported:
+        return yaml.load(text, Loader=YAMLLoader)
+
+
+def _load_simple(text: str) -> Any:
+    """Load the subset of YAML used by nearly all frontmatter."""
+    if '\t' in text or '\r' in text or '\ufeff' in text or NON_PRINTABLE.search(text):
+        raise _Unsupported()
+
+    result = None
+    block_key = None    # key whose value is an indented block
+    block = None        # the dict or list being filled for it
+    block_indent = None
+
+    for line in text.split('\n'):
+        stripped = line.lstrip(' ')
+        if not stripped or stripped[0] == '#':
+            continue
+        indent = len(line) - len(stripped)
+
+        # Nested lines belong to the last "key:" without a value; sequences
+        # may also start at the key's own indentation
+        is_item = stripped[:2] == '- '
+        if block_key is not None and (indent or is_item):
+            if block_indent is None:
+                block_indent = indent
+                block = [] if is_item else {}
+                result[block_key] = block
+            if indent != block_indent or is_item != isinstance(block, list):
+                raise _Unsupported()
+            if is_item:
+                block.append(_item(stripped[2:].strip(' ')))
+            else:
+                key, value, _ = _entry(stripped)
+                block[key] = value
+            continue
+        if indent:
+            raise _Unsupported()
+
+        key, value, has_value = _entry(line)
+        if result is None:
+            result = {}
+        result[key] = value
+        block_key = None if has_value else key
+        block = block_indent = None
+    return result
+
+
+def _entry(line: str) -> tuple:
+    """Split a ``key: value`` line into its key, value and whether a value was given."""
+    match = FLAT_LINE.match(line)
+    if not match:
+        raise _Unsupported()
+    value = match.group(2)
+    if not value:
+        return _plain_scalar(match.group(1)), None, False
+    return _plain_scalar(match.group(1)), _value(value), True
+
+
+def _item(text: str) -> Any:
+    """Build a sequence item: a scalar, a flow list or a single-key mapping."""
+    if not text:
+        raise _Unsupported()
+    if FLAT_LINE.match(text):
+        key, value, _ = _entry(text)
+        return {key: value}
+    return _value(text)
+
+
+def _value(text: str) -> Any:
+    """Build a value from the text after ``key:``."""
+    if text[0] == '[':
+        if text[-1] != ']':
+            raise _Unsupported()
+        inner = text[1:-1].strip()
+        if not inner:
+            return []
+        items = []
+        for item in inner.split(','):
+            item = item.strip()
+            if not item or any(char in item for char in '[]{}:#\'"'):
+                raise _Unsupported()
+            items.append(_plain_scalar(item))
+        return items
+
+    if text[0] in '\'"':
+        quote = text[0]
+        if len(text) < 2 or text[-1] != quote or quote in text[1:-1] or '\\' in text[1:-1]:
+            raise _Unsupported()
+        return text[1:-1]
+
+    if ': ' in text or ' #' in text or text[-1] == ':':
+        raise _Unsupported()
+    return _plain_scalar(text)
+
+
+@lru_cache(maxsize=4096)
+def _plain_scalar(text: str) -> Any:
+    """Resolve and construct a plain scalar exactly as the safe loader does."""
+    if text[0] in INDICATORS and not (text[0] == '-' and text[1:2].isdigit()):
+        raise _Unsupported()
+
+    tag = _scalar_loader.resolve(yaml.ScalarNode, text, (True, False))
+    if tag not in SCALAR_TAGS:
+        raise _Unsupported()
+    constructor = _scalar_loader.yaml_constructors[tag]
+    return constructor(_scalar_loader, yaml.ScalarNode(tag, text))
@@ -0,0 +1,207 @@
+"""MSL Markers - Table-driven grammar for requirement markers."""
+
+import hashlib
+import sys
+from typing import Dict, Any, Optional, Tuple
+
+
+# Requirement fields that markers write into, grouped by how a value is stored
+MAPPING_FIELDS = frozenset(["markers", "metrics"])
+LIST_FIELDS = frozenset(["tags", "categories"])
+
+# Code link arrows, keyed by first character; longer arrows are tried first
+CODE_LINK_ARROWS = {
+    '↔': [('↔', 'bidirectional')],
+    '→': [('→', 'forward')],
+    '←': [('←', 'backward')],
+    '<': [('<->', 'bidirectional'), ('<-', 'backward')],
+    '-': [('->', 'forward')],
+}
+
+
+class MarkerGrammar:
+    """Precompiled dispatch tables for simple and composite markers.
+
+    Composite markers (``[!|security|sprint:3]``) are split on pipes and each
+    component is resolved with a few dictionary lookups:
+
+    - code links by arrow prefix (``↔``, ``<->``, ``→``, ``->``, ``←``, ``<-``)
+    - ``key:value`` pairs through the key table
+    - bare components through the component table, then the ``@``/``#`` prefixes
+
+    Single markers without pipes, colons or arrows (``[!]``, ``[x]``) use the
+    separate simple table. Anything unknown is stored in ``markers``.
+    """
+
+    def __init__(self):
+        self.keys: Dict[str, Tuple[str, Optional[str]]] = {}
+        self.components: Dict[str, Tuple[str, Any]] = {}
+        self.simple: Dict[str, Tuple[str, Any]] = {}
+        self.prefixes: Dict[str, str] = {'@': 'assignee', '#': 'tags'}
+
+        # key:value markers
+        for key in ['estimate', 'actual', 'variance', 'progress', 'coverage', 'confidence']:
+            self.register_key(key, "metrics")
+        self.register_key('deployed', "status", "deployed:{}")
+
+        # Bare composite components
+        self.register_component('!', "priority", "critical")
+        self.register_component('!!', "priority", "urgent")
+        self.register_component('~', "priority", "low")
+        for status in ['blocked', 'testing', 'review', 'complete', 'pending']:
+            self.register_component(status, "status")
+        for category in ['security', 'performance', 'ui', 'api', 'database']:
+            self.register_component(category, "categories")
+
+        # Single markers
+        self.register_simple('!', "priority", "critical")
+        self.register_simple('!!', "priority", "urgent")
+        self.register_simple('~', "priority", "low")
+        self.register_simple('?', "status", "uncertain")
+        self.register_simple('x', "status", "complete")
+        self.register_simple(' ', "status", "pending")
+
+    def register_key(self, key: str, field: str = "markers", template: Optional[str] = None):
+        """Route ``key:value`` components to a requirement field.
+
+        ``template`` formats the value before it is stored, e.g. ``"deployed:{}"``.
+        """
+        self.keys[key] = (field, template)
+
+    def register_component(self, component: str, field: str = "markers", value: Any = None):
+        """Route a bare composite component to a requirement field.
+
+        Without a ``value`` the component itself is stored (``True`` for ``markers``).
+        """
+        self.components[component] = (field, self._default_value(component, field, value))
+
+    def register_simple(self, marker: str, field: str = "markers", value: Any = None):
+        """Route a single, non-composite marker to a requirement field."""
+        self.simple[marker] = (field, self._default_value(marker, field, value))
+
+    def _default_value(self, name: str, field: str, value: Any) -> Any:
+        if value is not None:
+            return value
+        return True if field in MAPPING_FIELDS else name
+
+    def fingerprint(self) -> str:
+        """Return a short digest of the tables, which changes with any registration."""
+        tables = (self.keys, self.components, self.simple, self.prefixes)
+        return hashlib.sha1(repr([sorted(table.items(), key=repr) for table in tables]).encode('utf-8')).hexdigest()
+
+    def is_composite(self, content: str) -> bool:
+        """Check whether marker content needs the composite grammar."""
+        return '|' in content or ':' in content or self._match_arrow(content) is not None
+
+    def parse(self, content: str, requirement: Dict[str, Any]):
+        """Parse the content of a marker block into ``requirement``."""
+        if self.is_composite(content):
+            self.parse_composite(content, requirement)
+        else:
+            self.parse_simple(content, requirement)
+
+    def parse_simple(self, marker: str, requirement: Dict[str, Any]):
+        """Parse a simple single marker."""
+        action = self.simple.get(marker)
+        if action is not None:
+            self._store(requirement, action[0], marker, action[1])
+        elif marker[:1] in self.prefixes:
+            self._store(requirement, self.prefixes[marker[:1]], marker, marker[1:])
+        else:
+            requirement["markers"][marker] = True
+
+    def parse_composite(self, content: str, requirement: Dict[str, Any]):
+        """Parse composite markers separated by pipes."""
+        keys = self.keys
+        components = self.components
+        prefixes = self.prefixes
+        store = self._store
+
+        for component in content.split('|'):
+            component = component.strip()
+
+            # Skip empty components
+            if not component:
+                continue
+
+            # Code links take precedence over everything else
+            if component[0] in CODE_LINK_ARROWS:
+                arrow = self._match_arrow(component)
+                if arrow is not None:
+                    self.parse_code_link(requirement, component[len(arrow[0]):].strip(), arrow[1])
+                    continue
+
+            if ':' in component:
+                key, value = component.split(':', 1)
+                key = key.strip()
+                field, template = keys.get(key, ("markers", None))
+                value = value.strip()
+                store(requirement, field, key, template.format(value) if template else value)
+                continue
+
+            action = components.get(component)
+            if action is not None:
+                store(requirement, action[0], component, action[1])
+            elif component[0] in prefixes:
+                store(requirement, prefixes[component[0]], component, component[1:])
+            else:
+                requirement["markers"][component] = True
+
+    def _match_arrow(self, text: str) -> Optional[Tuple[str, str]]:
+        """Return the (arrow, direction) that ``text`` starts with, if any."""
+        candidates = CODE_LINK_ARROWS.get(text[:1])
+        if candidates:
+            for arrow in candidates:
+                if text.startswith(arrow[0]):
+                    return arrow
+        return None
+
+    def _store(self, requirement: Dict[str, Any], field: str, key: str, value: Any):
+        """Store a marker value according to the kind of field it targets."""
+        if field in MAPPING_FIELDS:
+            requirement[field][sys.intern(key)] = value
+        elif field in LIST_FIELDS:
+            requirement[field].append(value)
+        else:
+            requirement[field] = value
+
+    def parse_code_link(self, requirement: Dict[str, Any], link_text: str, direction: str = 'bidirectional'):
+        """Parse code link and add to requirement."""
+        if "code_links" not in requirement:
+            requirement["code_links"] = []
+
+        # Parse link format: file.ext:line or file.ext:start-end
+        parts = link_text.split(':')
+        if len(parts) >= 2:
+            file_path = parts[0].strip()
+            line_spec = ':'.join(parts[1:]).strip()
+
+            # Parse line specification
+            if '-' in line_spec:
+                # Range format: 45-67
+                line_parts = line_spec.split('-')
+                start_line = line_parts[0].strip()
+                end_line = line_parts[1].strip() if len(line_parts) > 1 else start_line
+
+                requirement["code_links"].append({
+                    "file": file_path,
+                    "start_line": start_line,
+                    "end_line": end_line,
+                    "direction": direction,
+                    "raw": link_text
+                })
+            else:
+                # Single line format: 45
+                requirement["code_links"].append({
+                    "file": file_path,
+                    "line": line_spec,
+                    "direction": direction,
+                    "raw": link_text
+                })
+        else:
+            # Just file path, no line numbers
+            requirement["code_links"].append({
+                "file": link_text.strip(),
+                "direction": direction,
+                "raw": link_text
+            })
@@ -1,96 +1,622 @@
 """MSL Parser - Parse MSL markdown files into structured data."""
 
+import bisect
+import mmap
+import os
+import pickle
 import re
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from itertools import chain
+from typing import Dict, List, Optional, Any, Callable, Iterable, Iterator, TextIO
 import yaml
 
+from .cache import ParseCache
+from .frontmatter import load_frontmatter
+from .markers import MarkerGrammar
+from .requirement import Requirement
+
+
+# Bump whenever parse results for the same input change, to invalidate caches
+PARSER_VERSION = "3"
+
+
+class SourceText:
+    """Lazy handle to a document's source text, re-read from disk on demand."""
+    
+    __slots__ = ("path", "encoding")
+    
+    def __init__(self, path: str, encoding: str = 'utf-8'):
+        self.path = path
+        self.encoding = encoding
+        
+    def read(self) -> str:
+        """Read the current source text."""
+        return Path(self.path).read_text(encoding=self.encoding)
+    
+    def __str__(self):
+        return self.read()
+    
+    def __repr__(self):
+        return f"SourceText({self.path!r})"
+    
+    def __eq__(self, other):
+        if not isinstance(other, SourceText):
+            return NotImplemented
+        return (self.path, self.encoding) == (other.path, other.encoding)
+    
+    def __hash__(self):
+        return hash((self.path, self.encoding))
+
+
+# Placeholder for a LazyDocument value that has not been parsed yet
+_PENDING = object()
+
+
+class LazyDocument(MutableMapping):
+    """Parse result of a file whose body is only parsed when it is used.
+    
+    ``source``, ``level`` and ``metadata`` come from the frontmatter and are
+    available straight away. The first access to ``title``, ``summary``,
+    ``notes`` or ``sections`` reads the file again and scans its headings;
+    ``requirements`` are only built when they are read themselves. Values
+    are the same as ``MSLParser.parse_file`` would return, provided the file
+    does not change in between.
+    """
+    
+    BODY_KEYS = frozenset(["title", "summary", "requirements", "notes", "sections", "raw_content"])
+    
+    __slots__ = ("_parser", "_data", "_content", "_body")
+    
+    def __init__(self, parser: "MSLParser", source: str, level: int, metadata: Dict[str, Any],
+                 content: Optional[str] = None):
+        self._parser = parser
+        self._content = content
+        self._body = None
+        self._data = {
+            "source": source,
+            "level": level,
+            "metadata": metadata,
+            "title": _PENDING,
+            "summary": _PENDING,
+            "requirements": _PENDING,
+            "notes": _PENDING,
+            "sections": _PENDING,
+            "raw_content": _PENDING if parser.keep_raw_content else SourceText(source),
+        }
+        
+    def __getitem__(self, key: str) -> Any:
+        value = self._data[key]
+        if value is _PENDING:
+            if key == "requirements":
+                self._load_requirements()
+            else:
+                self._load_body()
+            value = self._data[key]
+        return value
+    
+    def __setitem__(self, key: str, value: Any):
+        self._data[key] = value
+        
+    def __delitem__(self, key: str):
+        del self._data[key]
+        
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __repr__(self):
+        return f"LazyDocument({self._data['source']!r})"
+    
+    def __reduce__(self):
+        # Pickles as the fully parsed dictionary
+        return dict, (dict(self),)
+    
+    def _load_body(self):
+        """Read the file and fill in everything but the requirements."""
+        if self._body is not None:
+            return
+        parser = self._parser
+        source = self._data["source"]
+        content = self._content
+        if content is None:
+            content = Path(source).read_text(encoding='utf-8')
+        self._content = None
+        
+        _, text, body_start = parser._extract_frontmatter(content)
+        tokens = parser._tokenize(text, body_start, requirement_lines=False)
+        result = parser._build_result(source, self._data["level"], self._data["metadata"],
+                                      text, tokens, [])
+        restore = parser._line_restorer(content) if text is not content else None
+        if restore is not None:
+            result["sections"] = {name: (restore(first), restore(last))
+                                  for name, (first, last) in result["sections"].items()}
+        result["raw_content"] = content
+        
+        for key in ("title", "summary", "notes", "sections", "raw_content"):
+            if self._data.get(key) is _PENDING:
+                self._data[key] = result[key]
+        self._body = (text, tokens, restore)
+        
+    def _load_requirements(self):
+        """Build the requirement hierarchy from the scanned body."""
+        self._load_body()
+        text, tokens, restore = self._body
+        requirements = []
+        if "requirements" in tokens["sections"]:
+            parser = self._parser
+            requirements = parser._build_requirements(parser._requirement_lines(text, tokens))
+            if restore is not None:
+                for root in requirements:
+                    for req in root.walk():
+                        req.line = restore(req.line)
+        self._data["requirements"] = requirements
+
 
 class MSLParser:
-    """Parse MSL markdown files into structured data."""
+    """Parse MSL markdown files into structured data.
+    
+    With ``keep_raw_content=False`` parsed documents do not hold on to their
+    source text: ``raw_content`` is a ``SourceText`` handle for files and
+    ``None`` for content parsed from a string.
     
-    def __init__(self):
+    With a ``cache``, ``parse_file`` looks results up by file content first
+    and only parses files it has not seen before.
+    """
+    
+    def __init__(self, grammar: Optional[MarkerGrammar] = None, keep_raw_content: bool = True,
+                 cache: Optional[ParseCache] = None):
+        self.grammar = grammar or MarkerGrammar()
+        self.keep_raw_content = keep_raw_content
+        self.cache = cache
         self.req_pattern = re.compile(r'^-\s*(REQ-\d+:)?\s*(.+)$', re.MULTILINE)
         self.hierarchical_req_pattern = re.compile(r'^(REQ-\d+(?:\.\d+)*):?\s*(.+)$')
         self.marker_pattern = re.compile(r'^\[([\!\?\@\#]|x|\s)\]\s*(.+)$')
+        self.title_pattern = re.compile(r'#\s+(.+)$', re.MULTILINE)
+        self.section_pattern = re.compile(r'##\s+(\w+)\s*$', re.MULTILINE)
+        self.section_name_pattern = re.compile(r'\s*(\w+)\s*$')
+        self.comment_extends_pattern = re.compile(r'<!--\s*extends:\s*([^\s]+)\s*-->')
+        self.comment_extends_strip_pattern = re.compile(r'<!--\s*extends:\s*[^\s]+\s*-->\n?')
+        self.req_id_pattern = re.compile(r'^(REQ-\d+(?:\.\d+)*):\s*(.+)$')
+        self.override_pattern = re.compile(r'^\[(OVERRIDE)\]|^modified:\s*', re.IGNORECASE)
+        self.new_pattern = re.compile(r'^\[(NEW)\]|^new:\s*', re.IGNORECASE)
+        self.marker_block_pattern = re.compile(r'^\[([^\]]+)\]\s*(.+)$')
+        self.lone_cr_pattern = re.compile(rb'\r(?!\n)')
+        
+    def parse_file(self, file_path: str, header_only: bool = False,
+                   sections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Parse an MSL file and return structured data.
         
-    def parse_file(self, file_path: str) -> Dict[str, Any]:
-        """Parse an MSL file and return structured data."""
+        With ``header_only=True`` or ``sections`` a ``LazyDocument`` is
+        returned instead. Only the frontmatter is read up front; for indexing
+        by ``id``, level or ``extends`` nothing else is needed. ``sections``
+        names the result keys (e.g. ``["requirements"]``) to parse straight
+        away; all others are parsed when first accessed. Lazy documents do not
+        use the cache.
+        """
         path = Path(file_path)
         if not path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
             
+        if header_only or sections is not None:
+            return self._parse_file_lazy(path, file_path, sections or ())
+            
+        if self.cache is not None:
+            return self._parse_file_cached(path, file_path)
+            
         content = path.read_text(encoding='utf-8')
-        return self.parse_content(content, file_path)
+        result = self.parse_content(content, file_path)
+        if not self.keep_raw_content:
+            result["raw_content"] = SourceText(file_path)
+        return result
+    
+    def _parse_file_lazy(self, path: Path, file_path: str, sections: Iterable[str]) -> LazyDocument:
+        """Read a file's frontmatter and defer the rest to a LazyDocument."""
+        sections = list(sections)
+        unknown = set(sections) - LazyDocument.BODY_KEYS
+        if unknown:
+            raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+            
+        frontmatter, content = self._read_header(path)
+        level, metadata = self._header(frontmatter, file_path)
+        document = LazyDocument(self, file_path, level, metadata, content)
+        for key in sections:
+            document[key]
+        return document
+    
+    def _read_header(self, path: Path) -> tuple[Optional[Dict], Optional[str]]:
+        """Read a file up to the end of its frontmatter.
+        
+        Returns the frontmatter and, when the whole file had to be read
+        anyway, its decoded content.
+        """
+        with open(path, 'rb') as f:
+            head = bytearray(f.read(4096))
+            if head[:3] != b'---':
+                # Comment extends may be anywhere in the document
+                content = self._decode(head + f.read())
+                return self._extract_frontmatter(content)[0], content
+                
+            end = head.find(b'---', 3)
+            while end == -1:
+                chunk = f.read(1 << 16)
+                if not chunk:
+                    return None, self._decode(head)
+                search_from = max(3, len(head) - 2)
+                head += chunk
+                end = head.find(b'---', search_from)
+                
+        try:
+            return load_frontmatter(self._decode(head[3:end])) or {}, None
+        except yaml.YAMLError:
+            return None, None
+    
+    def _parse_file_cached(self, path: Path, file_path: str) -> Dict[str, Any]:
+        """Parse a file through the cache, keyed by its bytes and the parser setup."""
+        data = path.read_bytes()
+        key = self.cache.key(data, file_path, f"{PARSER_VERSION}:{self.grammar.fingerprint()}")
+        
+        content = None
+        result = self.cache.get(key)
+        if result is None:
+            content = self._decode(data)
+            result = self._parse_text(content, file_path)
+            self.cache.put(key, result)
+            
+        if not self.keep_raw_content:
+            result["raw_content"] = SourceText(file_path)
+        else:
+            result["raw_content"] = content if content is not None else self._decode(data)
+        return result
+    
+    def parse_many(self, paths: Iterable[str], jobs: Optional[int] = None,
+                   chunksize: Optional[int] = None) -> Iterator[tuple[str, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """Parse many files across a pool of worker processes.
+        
+        Yields ``(path, result, error)`` in the order of ``paths`` as soon as
+        each result is available. A file that fails to parse yields its
+        exception as ``error`` (and ``result`` None) without stopping the batch.
+        ``jobs`` defaults to the number of CPUs; with one job, or a single
+        file, everything runs in this process. Workers parse with a copy of
+        this parser, including its grammar, options and cache.
+        """
+        paths = list(paths)
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        jobs = max(1, min(jobs, len(paths)))
+        
+        if jobs == 1:
+            for path in paths:
+                yield _parse_with(self, path)
+            return
+            
+        # A few chunks per worker balances load without paying per-file IPC
+        if chunksize is None:
+            chunksize = max(1, min(64, len(paths) // (jobs * 4)))
+            
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_parse_worker,
+                                 initargs=(self,)) as executor:
+            yield from executor.map(_parse_in_worker, paths, chunksize=chunksize)
+    
+    def parse_path(self, file_path: str) -> Dict[str, Any]:
+        """Parse an MSL file through a read-only memory map.
+        
+        Section and requirement boundaries are found on the mapped bytes and
+        only the spans that end up in the result are decoded, so peak memory
+        stays close to the size of the output. ``raw_content`` is always a
+        ``SourceText`` handle.
+        """
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+            
+        with open(path, 'rb') as f:
+            if path.stat().st_size == 0:
+                result = self._parse_buffer(b'', file_path)
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    result = self._parse_buffer(data, file_path)
+                    
+        result["raw_content"] = SourceText(file_path)
+        return result
+    
+    def parse_bytes(self, data: bytes, source: str = "unknown") -> Dict[str, Any]:
+        """Parse UTF-8 encoded MSL content, decoding only the spans that are kept.
+        
+        Line endings are normalised as if ``data`` had been read from a file.
+        """
+        result = self._parse_buffer(data, source)
+        if self.keep_raw_content:
+            result["raw_content"] = self._decode(data)
+        return result
     
     def parse_content(self, content: str, source: str = "unknown") -> Dict[str, Any]:
         """Parse MSL content and return structured data."""
-        result = {
-            "source": source,
-            "level": 0,
-            "metadata": {},
-            "title": None,
-            "summary": None,
-            "requirements": [],
-            "notes": None,
-            "raw_content": content
-        }
+        result = self._parse_text(content, source)
+        if self.keep_raw_content:
+            result["raw_content"] = content
+        return result
+    
+    def reparse(self, previous: Dict[str, Any], content: str, start_line: int,
+                old_end_line: int, new_end_line: int) -> Dict[str, Any]:
+        """Re-parse a document after an edit, reusing what the edit did not touch.
+        
+        Lines ``start_line`` up to ``old_end_line`` of the previously parsed
+        document (1-based, end exclusive) were replaced by lines ``start_line``
+        up to ``new_end_line`` of ``content``. Frontmatter above the edit is not
+        loaded again and only the top-level requirement subtrees around the
+        edit are parsed again; the others are moved into the new result with
+        their ``line`` shifted, so ``previous`` should not be used afterwards.
+        
+        Edits that could change the document in non-local ways (frontmatter,
+        the requirements heading, HTML comment extends) fall back to a full
+        ``parse_content``, so the result always equals a fresh parse.
+        """
+        source = previous["source"]
+        body_start = self._reusable_body_start(previous, content, start_line)
+        if body_start is None:
+            return self.parse_content(content, source)
+            
+        # Headings are rescanned, which only visits lines starting with "#"
+        tokens = self._tokenize(content, body_start, requirement_lines=False)
+        requirements = []
+        if "requirements" in tokens["sections"]:
+            requirements = self._reparse_requirements(
+                previous, content, tokens, start_line, old_end_line, new_end_line - old_end_line)
+            
+        result = self._build_result(source, previous["level"], previous["metadata"],
+                                    content, tokens, requirements)
+        if self.keep_raw_content:
+            result["raw_content"] = content
+        return result
+    
+    def _reusable_body_start(self, previous: Dict[str, Any], content: str,
+                             start_line: int) -> Optional[int]:
+        """Return where the body starts if the previous metadata still applies."""
+        if content[:3] == '---':
+            end = content.find('---', 3)
+            if end == -1 or previous["level"] == 0:
+                return None
+            # The frontmatter must end above the edit
+            if start_line <= content.count('\n', 0, end) + 1:
+                return None
+            return end + 3
+            
+        # Comment extends rewrite the body, so they always get a full parse
+        if previous["level"] != 0 or '<!--' in content:
+            return None
+        return 0
+    
+    def _reparse_requirements(self, previous: Dict[str, Any], content: str,
+                              tokens: Dict[str, Any], start_line: int,
+                              old_end_line: int, delta: int) -> List[Requirement]:
+        """Rebuild the requirement list, parsing only subtrees touched by an edit."""
+        roots = previous["requirements"]
+        old_span = previous.get("sections", {}).get("requirements")
+        new_first, new_last = tokens["section_lines"]["requirements"]
+        
+        def full_parse():
+            return self._build_requirements(self._requirement_lines(content, tokens))
+            
+        def moved(line_number):
+            if line_number < start_line:
+                return line_number
+            if line_number >= old_end_line:
+                return line_number + delta
+            return None
+            
+        if old_span is None or not roots or roots[0].line is None:
+            return full_parse()
+        old_first, old_last = old_span
+        if moved(old_first) != new_first:
+            return full_parse()
+            
+        # Edit below the section: nothing moves
+        if old_last < start_line:
+            return list(roots) if new_last == old_last else full_parse()
+            
+        # Edit above the section: everything moves by the same amount
+        if old_first >= old_end_line:
+            if new_last != old_last + delta:
+                return full_parse()
+            for root in roots:
+                self._shift_lines(root, delta)
+            return list(roots)
+            
+        if old_last >= old_end_line and new_last != old_last + delta:
+            return full_parse()
+            
+        # Re-parse from the last top-level requirement above the edit to the
+        # first one below it. The section's first requirement is special (its
+        # indentation is ignored and it may be an orphan), so never start there.
+        root_lines = [root.line for root in roots]
+        first = bisect.bisect_left(root_lines, start_line) - 1
+        if first < 1:
+            return full_parse()
+        last = bisect.bisect_left(root_lines, old_end_line, first + 1)
+        
+        start, end = tokens["sections"]["requirements"]
+        line_number = tokens["content_lines"]["requirements"]
+        window_start = start
+        for _ in range(roots[first].line - line_number):
+            window_start = content.find('\n', window_start) + 1
+        window_end = end
+        if last < len(roots):
+            window_end = window_start
+            for _ in range(roots[last].line + delta - roots[first].line):
+                window_end = content.find('\n', window_end) + 1
+                
+        lines = []
+        line_number = roots[first].line
+        for line in content[window_start:window_end].split('\n'):
+            line_content = line.strip()
+            if line_content.startswith('-'):
+                indent = len(line) - len(line.lstrip())
+                lines.append((indent, line_content, line_number, indent + 1))
+            line_number += 1
+            
+        for root in roots[last:]:
+            self._shift_lines(root, delta)
+        return roots[:first] + self._build_requirements(lines) + roots[last:]
+    
+    def _shift_lines(self, requirement: Requirement, delta: int):
+        """Move a requirement subtree by ``delta`` lines."""
+        if delta:
+            for req in requirement.walk():
+                req.line += delta
+    
+    def _parse_text(self, content: str, source: str) -> Dict[str, Any]:
+        """Parse decoded content, reporting line numbers against ``content``."""
+        frontmatter, text, body_start = self._extract_frontmatter(content)
+        result = self._parse_body(frontmatter, text, body_start, source)
+        if text is not content:
+            self._restore_line_numbers(result, content)
+        return result
+    
+    def _parse_buffer(self, data, source: str) -> Dict[str, Any]:
+        """Parse UTF-8 bytes or a memory map, falling back to text when needed.
+        
+        Line endings are normalised as when a file is read in text mode.
+        """
+        result = None
         
-        # Extract frontmatter if present
-        frontmatter, body = self._extract_frontmatter(content)
+        # HTML comment extends rewrite the body and lone carriage returns split
+        # lines differently, so those documents take the text path
+        if ((data[:3] == b'---' or data.find(b'<!--') == -1)
+                and not self.lone_cr_pattern.search(data)):
+            frontmatter, text, body_start = self._extract_frontmatter(data)
+            result = self._parse_body(frontmatter, text, body_start, source)
+            
+        if result is None:
+            result = self._parse_text(self._decode(data[:]), source)
+        return result
+    
+    def _parse_body(self, frontmatter: Optional[Dict], text, body_start: int,
+                    source: str) -> Optional[Dict[str, Any]]:
+        """Build the parse result from extracted frontmatter and the document body.
+        
+        Returns None when a bytes body has a heading that can only be matched
+        against the decoded text.
+        """
+        # Tokenize the body in a single pass
+        tokens = self._tokenize(text, body_start)
+        if tokens is None:
+            return None
+            
+        level, metadata = self._header(frontmatter, source)
+        
+        requirements = []
+        if "requirements" in tokens["sections"]:
+            requirements = self._build_requirements(tokens["requirement_lines"])
+            
+        return self._build_result(source, level, metadata, text, tokens, requirements)
+    
+    def _header(self, frontmatter: Optional[Dict], source: str) -> tuple[int, Dict[str, Any]]:
+        """Return the level and metadata for extracted frontmatter."""
+        level = 0
+        metadata = {}
         if frontmatter:
-            result["metadata"] = frontmatter
-            result["level"] = 1 if "id" in frontmatter else 2
+            metadata = frontmatter
+            level = 1 if "id" in frontmatter else 2
         
         # Extract file ID from path if no frontmatter ID
-        if "id" not in result["metadata"] and source != "unknown":
-            result["metadata"]["id"] = Path(source).stem
+        if "id" not in metadata and source != "unknown":
+            metadata["id"] = Path(source).stem
             
         # Apply defaults
-        self._apply_defaults(result["metadata"])
-        
-        # Parse body sections
-        sections = self._parse_sections(body)
+        self._apply_defaults(metadata)
+        return level, metadata
+    
+    def _build_result(self, source: str, level: int, metadata: Dict[str, Any], text,
+                      tokens: Dict[str, Any], requirements: List[Requirement]) -> Dict[str, Any]:
+        """Assemble the parse result from tokenized sections."""
+        sections = tokens["sections"]
+        result = {
+            "source": source,
+            "level": level,
+            "metadata": metadata,
+            "title": None,
+            "summary": None,
+            "requirements": requirements,
+            "notes": None,
+            "sections": tokens["section_lines"],
+            "raw_content": None
+        }
         
-        # Extract title
+        # Extract title (a "## Title" section takes precedence over the "# " heading)
         if "title" in sections:
-            result["title"] = sections["title"]
+            result["title"] = self._section_text(text, sections["title"])
+        elif tokens["title"] is not None:
+            result["title"] = tokens["title"]
             
         # Extract summary
         if "summary" in sections:
-            result["summary"] = sections["summary"]
-            
-        # Extract requirements
-        if "requirements" in sections:
-            result["requirements"] = self._parse_requirements(sections["requirements"])
+            result["summary"] = self._section_text(text, sections["summary"])
             
         # Extract notes
         if "notes" in sections:
-            result["notes"] = sections["notes"]
+            result["notes"] = self._section_text(text, sections["notes"])
             
         return result
     
-    def _extract_frontmatter(self, content: str) -> tuple[Optional[Dict], str]:
-        """Extract YAML frontmatter and return (metadata, remaining_content)."""
-        if not content.startswith('---'):
+    def _extract_frontmatter(self, content) -> tuple[Optional[Dict], Any, int]:
+        """Extract YAML frontmatter and return (metadata, text, body_start).
+        
+        The body is ``text[body_start:]``. ``text`` is ``content`` itself unless
+        an HTML comment ``extends`` had to be stripped out of it. ``content``
+        may also be UTF-8 bytes or a memory map without comment extends.
+        """
+        binary = not isinstance(content, str)
+        if content[:3] != (b'---' if binary else '---'):
             # Check for HTML comment style extends
-            comment_extends = re.search(r'<!--\s*extends:\s*([^\s]+)\s*-->', content)
+            comment_extends = None if binary else self.comment_extends_pattern.search(content)
             if comment_extends:
                 metadata = {"extends": comment_extends.group(1)}
-                body = re.sub(r'<!--\s*extends:\s*[^\s]+\s*-->\n?', '', content)
-                return metadata, body
-            return None, content
+                body = self.comment_extends_strip_pattern.sub('', content)
+                return metadata, body, 0
+            return None, content, 0
             
-        try:
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                metadata = yaml.safe_load(parts[1])
-                body = parts[2]
-                return metadata or {}, body
-        except yaml.YAMLError:
-            pass
+        end = content.find(b'---' if binary else '---', 3)
+        if end != -1:
+            frontmatter = content[3:end]
+            try:
+                metadata = load_frontmatter(self._decode(frontmatter) if binary else frontmatter)
+                return metadata or {}, content, end + 3
+            except yaml.YAMLError:
+                pass
+            
+        return None, content, 0
+    
+    def _restore_line_numbers(self, result: Dict[str, Any], content: str):
+        """Map line numbers in a body with stripped comment extends back to ``content``.
+        
+        Each stripped comment that took its newline with it joins two lines, so
+        every later line moves up by one.
+        """
+        restore = self._line_restorer(content)
+        if restore is None:
+            return
+        result["sections"] = {name: (restore(first), restore(last))
+                              for name, (first, last) in result["sections"].items()}
+        for root in result["requirements"]:
+            for req in root.walk():
+                req.line = restore(req.line)
+    
+    def _line_restorer(self, content: str) -> Optional[Callable[[int], int]]:
+        """Return a function mapping body line numbers back to ``content``, if any moved."""
+        joins = []
+        for match in self.comment_extends_strip_pattern.finditer(content):
+            if match.group().endswith('\n'):
+                joins.append(content.count('\n', 0, match.start()) + 1 - len(joins))
+        if not joins:
+            return None
             
-        return None, content
+        def restore(line_number):
+            return line_number + bisect.bisect_left(joins, line_number)
+        return restore
     
     def _apply_defaults(self, metadata: Dict[str, Any]):
         """Apply smart defaults to metadata."""
@@ -104,342 +630,409 @@ class MSLParser:
             if key not in metadata:
                 metadata[key] = value
     
-    def _parse_sections(self, content: str) -> Dict[str, str]:
-        """Parse markdown sections."""
+    def _tokenize(self, text, start: int = 0,
+                  requirement_lines: bool = True) -> Optional[Dict[str, Any]]:
+        """Scan the body once, collecting title, section spans and requirement lines.
+        
+        Only lines starting with ``#`` are visited while scanning; the
+        requirements section is then split into lines on its own. Section spans
+        are ``(start, end)`` offsets into ``text``, section lines are 1-based
+        ``(heading line, last line)`` pairs and requirement lines are
+        ``(indent, line, line number, column)`` tuples from the last ``## Requirements``
+        section.
+        
+        ``text`` may be UTF-8 bytes or a memory map, in which case only heading
+        lines and kept sections are decoded. A bare ``#`` or ``##`` line can
+        match across lines in the decoded text, so for bytes it returns None.
+        """
+        binary = not isinstance(text, str)
+        newline, heading_start = (b'\n', b'\n#') if binary else ('\n', '\n#')
+        end = len(text)
+        title = None
         sections = {}
+        section_lines = {}
+        content_lines = {}
+        section_name = None
+        section_start = start
         
-        # Extract title (first # heading)
-        title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-        if title_match:
-            sections["title"] = title_match.group(1).strip()
+        # Line numbers are counted between the headings that are visited
+        line_number = self._count_newlines(text, 0, start) + 1
+        counted = start
         
-        # Extract sections by ## headings
-        section_pattern = re.compile(r'^##\s+(\w+)\s*$', re.MULTILINE)
-        matches = list(section_pattern.finditer(content))
+        line_start = start
+        if text[start:start + 1] != heading_start[1:]:
+            line_start = text.find(heading_start, start)
+            if line_start != -1:
+                line_start += 1
+                
+        while line_start != -1:
+            line_end = text.find(newline, line_start)
+            if line_end == -1:
+                line_end = end
+                
+            if binary:
+                # Headings are matched on the decoded line
+                line = text[line_start:line_end].decode('utf-8')
+                if line.rstrip() in ('#', '##'):
+                    return None
+                heading = self.section_pattern.match(line)
+                content_start = min(line_end + 1, end)
+                title_match = self.title_pattern.match(line) if title is None and not heading else None
+            else:
+                # Headings are matched against the full text at the line start so
+                # that, as with a MULTILINE search, "\s" may run onto following lines
+                heading = self.section_pattern.match(text, line_start)
+                content_start = heading.end() if heading else None
+                title_match = self.title_pattern.match(text, line_start) if title is None and not heading else None
+                
+            if heading:
+                line_number += self._count_newlines(text, counted, line_start)
+                counted = line_start
+                
+                # Close the previous section at the start of this heading
+                if section_name is not None:
+                    sections[section_name] = (section_start, line_start)
+                    section_lines[section_name] = (section_lines[section_name][0], line_number - 1)
+                section_name = heading.group(1).lower()
+                section_start = content_start
+                section_lines[section_name] = (line_number, None)
+                content_lines[section_name] = line_number + self._count_newlines(text, line_start, content_start)
+            elif title_match:
+                title = title_match.group(1).strip()
+                
+            line_start = text.find(heading_start, line_end)
+            if line_start != -1:
+                line_start += 1
         
-        for i, match in enumerate(matches):
-            section_name = match.group(1).lower()
-            start = match.end()
-            end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
-            section_content = content[start:end].strip()
-            sections[section_name] = section_content
+        if section_name is not None:
+            sections[section_name] = (section_start, end)
+            last_line = line_number + self._count_newlines(text, counted, max(end - 1, counted))
+            section_lines[section_name] = (section_lines[section_name][0], last_line)
             
-        return sections
+        tokens = {
+            "title": title,
+            "sections": sections,
+            "section_lines": section_lines,
+            "content_lines": content_lines,
+            "requirement_lines": []
+        }
+        if requirement_lines and "requirements" in sections:
+            tokens["requirement_lines"] = self._requirement_lines(text, tokens)
+        return tokens
     
-    def _parse_requirements(self, content: str) -> List[Dict[str, Any]]:
-        """Parse requirements section into structured list with hierarchy support."""
-        requirements = []
-        lines = content.split('\n')
-        current_parent = None
-        parent_stack = []  # Stack to track parent requirements at each level
+    def _requirement_lines(self, text, tokens: Dict[str, Any]) -> List[tuple[int, str, int, int]]:
+        """Split the requirements section into (indent, line, line number, column) tuples."""
+        start, end = tokens["sections"]["requirements"]
+        section = text[start:end]
+        if not isinstance(section, str):
+            section = self._decode(section)
+            
+        # The section is stripped, so its first line never counts as indented
+        body = section.lstrip()
+        lead = len(section) - len(body)
+        line_number = tokens["content_lines"]["requirements"] + section.count('\n', 0, lead)
         
-        for line_num, line in enumerate(lines):
-            # Check indentation level (count leading spaces)
-            indent_level = len(line) - len(line.lstrip())
+        requirement_lines = []
+        first = True
+        for line in body.rstrip().split('\n'):
             line_content = line.strip()
+            indent = len(line) - len(line.lstrip())
+            if first:
+                # Its real column is wherever the stripped whitespace left off
+                column = lead - section.rfind('\n', 0, lead)
+                first = False
+            else:
+                column = indent + 1
+            if line_content.startswith('-'):
+                requirement_lines.append((indent, line_content, line_number, column))
+            line_number += 1
+        return requirement_lines
+    
+    def _count_newlines(self, text, start: int, end: int) -> int:
+        """Count line breaks in ``text[start:end]`` without copying all of it."""
+        if isinstance(text, (str, bytes)):
+            return text.count('\n' if isinstance(text, str) else b'\n', start, end)
             
-            if not line_content or not line_content.startswith('-'):
-                continue
-            
+        # Memory maps have no count(), so count a bounded window at a time
+        count = 0
+        while start < end:
+            stop = min(start + (1 << 20), end)
+            count += text[start:stop].count(b'\n')
+            start = stop
+        return count
+    
+    def _section_text(self, text, span: tuple[int, int]) -> str:
+        """Return the stripped content of a section span, decoding bytes."""
+        content = text[span[0]:span[1]]
+        if not isinstance(content, str):
+            content = self._decode(content)
+        return content.strip()
+    
+    def _decode(self, data) -> str:
+        """Decode UTF-8 bytes with the newline translation of text-mode reads."""
+        text = bytes(data).decode('utf-8')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+    
+    def _build_requirements(self, lines: Iterable[tuple[int, str, int, int]]) -> List[Requirement]:
+        """Build the requirement hierarchy from tokenized (indent, line, line number, column) tuples."""
+        return [req for req, is_root in self._link_requirements(lines) if is_root]
+    
+    def _link_requirements(self, lines: Iterable[tuple[int, str, int, int]],
+                           attach: bool = True) -> Iterator[tuple[Requirement, bool]]:
+        """Parse (indent, line, line number, column) tuples and link them by indentation.
+        
+        Yields ``(requirement, is_root)`` as soon as each line is parsed, with
+        ``depth``, ``parent_id``, source positions and auto-generated IDs filled in. Children are
+        appended to their parents only when ``attach`` is true.
+        """
+        parent_stack = []  # [requirement, child count] for each open level
+        
+        for indent_level, line_content, line_number, column in lines:
             # Parse the requirement
-            req = self._parse_requirement_line(line_content)
-            if not req:
+            req = self._parse_requirement_line(line_content, column)
+            if req is None:
                 continue
+            req.line = line_number
                 
             # Determine hierarchy based on indentation (2 spaces per level)
             depth = indent_level // 2
-            req["depth"] = depth
-            req["parent_id"] = None
-            req["children"] = []
-            
-            # Handle hierarchical structure
-            if depth == 0:
-                # Top-level requirement
-                requirements.append(req)
-                parent_stack = [req]  # Reset stack with this as root
-                current_parent = req
-            else:
-                # Sub-requirement - find appropriate parent
+            req.depth = depth
+            
+            # Sub-requirement - find appropriate parent
+            if depth:
                 while len(parent_stack) > depth:
                     parent_stack.pop()
                     
-                if parent_stack:
-                    parent = parent_stack[-1]
-                    req["parent_id"] = parent.get("id")
+            if depth and parent_stack:
+                entry = parent_stack[-1]
+                parent = entry[0]
+                entry[1] += 1
+                req.parent_id = parent.id
+                
+                # Auto-generate hierarchical ID if not provided
+                if not req.id and parent.id:
+                    req.id = f"{parent.id}.{entry[1]}"
+                
+                if attach:
+                    parent["children"].append(req)
+                parent_stack.append([req, 0])
+                yield req, False
+            else:
+                # Top-level (or orphaned) requirement resets the stack
+                parent_stack = [[req, 0]]
+                yield req, True
+    
+    def iter_requirements(self, file_path: str) -> Iterator[Requirement]:
+        """Stream requirements from a file one at a time, in document order.
+        
+        Each requirement has its ``depth``, ``parent_id``, ``line`` and
+        (auto-generated) ``id`` set, but ``children`` are not attached, so memory use does not
+        grow with the size of the file. Unlike ``parse_file``, requirements
+        from every ``## Requirements`` section are yielded, not just the last.
+        """
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+            
+        with open(path, encoding='utf-8') as f:
+            lines = self._requirement_stream(self._join_bare_headings(self._body_stream(f)))
+            for req, _ in self._link_requirements(lines, attach=False):
+                yield req
+    
+    def _body_stream(self, f: TextIO) -> Iterator[tuple[int, str]]:
+        """Yield (line number, line) for the body of an open document, without line endings."""
+        first = f.readline()
+        head = [first]
+        first_line = 1
+        
+        if first.startswith('---'):
+            # The frontmatter ends at the next "---", wherever it is on its line
+            end = first.find('---', 3)
+            while end == -1:
+                line = f.readline()
+                if not line:
+                    break
+                head.append(line)
+                end = line.find('---')
+                
+            if end != -1:
+                frontmatter = ''.join(head[:-1]) + head[-1][:end]
+                try:
+                    load_frontmatter(frontmatter[3:])
+                    first_line = len(head)
+                    head = [head[-1][end + 3:]]
+                except yaml.YAMLError:
+                    pass
                     
-                    # Auto-generate hierarchical ID if not provided
-                    if not req.get("id") and parent.get("id"):
-                        parent_child_count = len(parent["children"]) + 1
-                        req["id"] = f"{parent['id']}.{parent_child_count}"
+            lines = enumerate(chain(head, f), first_line)
+        else:
+            lines = self._strip_comment_extends(enumerate(chain(head, f), first_line))
+            
+        for line_number, line in lines:
+            yield line_number, line[:-1] if line.endswith('\n') else line
+    
+    def _strip_comment_extends(self, lines: Iterable[tuple[int, str]]) -> Iterator[tuple[int, str]]:
+        """Remove HTML comment extends, joining lines whose newline went with it."""
+        carry = None
+        for line_number, line in lines:
+            if carry is not None:
+                line_number, line = carry[0], carry[1] + line
+                carry = None
+            if '<!--' in line:
+                line = self.comment_extends_strip_pattern.sub('', line)
+                if not line.endswith('\n'):
+                    carry = (line_number, line)
+                    continue
+            yield line_number, line
+        if carry is not None and carry[1]:
+            yield carry
+    
+    def _join_bare_headings(self, lines: Iterable[tuple[int, str]]) -> Iterator[tuple[int, str]]:
+        """Join a bare ``##`` line to a section name on the next non-blank line.
+        
+        In the full text ``section_pattern`` lets the whitespace after ``##``
+        run onto following lines, so ``##\\nRequirements`` is a heading there.
+        """
+        lines = iter(lines)
+        pending = []
+        
+        def take():
+            return pending.pop() if pending else next(lines, None)
+            
+        while True:
+            item = take()
+            if item is None:
+                return
+            line_number, line = item
+            if line.startswith('##') and not line[2:].strip():
+                held = []
+                following = take()
+                while following is not None:
+                    held.append(following)
+                    if following[1].strip():
+                        break
+                    following = take()
+                name = self.section_name_pattern.match(held[-1][1]) if held else None
+                if name:
+                    yield line_number, f"## {name.group(1)}"
+                    continue
+                pending.extend(reversed(held))
+            yield item
+            
+    def _requirement_stream(self, lines: Iterable[tuple[int, str]]) -> Iterator[tuple[int, str, int, int]]:
+        """Yield (indent, line, line number, column) tuples from every requirements section in ``lines``."""
+        in_requirements = False
+        at_section_start = False
+        
+        for line_number, line in lines:
+            if line.startswith('##'):
+                heading = self.section_pattern.match(line)
+                if heading:
+                    in_requirements = heading.group(1).lower() == "requirements"
+                    at_section_start = True
+                    continue
                     
-                    parent["children"].append(req)
-                    parent_stack.append(req)
-                else:
-                    # Orphaned sub-requirement, add as top-level
-                    requirements.append(req)
-                    parent_stack = [req]
+            if not in_requirements:
+                continue
                 
-        return requirements
+            line_content = line.strip()
+            if not line_content:
+                continue
+                
+            # Section content is stripped, so its first line never counts as indented
+            column = len(line) - len(line.lstrip()) + 1
+            if at_section_start:
+                indent_level = 0
+                at_section_start = False
+            else:
+                indent_level = column - 1
+                
+            if line_content.startswith('-'):
+                yield indent_level, line_content, line_number, column
     
-    def _parse_requirement_line(self, line: str) -> Optional[Dict[str, Any]]:
-        """Parse a single requirement line."""
+    def _parse_requirement_line(self, line: str, column: Optional[int] = None) -> Optional[Requirement]:
+        """Parse a single requirement line, starting at ``column`` of its source line."""
+        source_line = line
+        
         # Remove leading dash
         line = line[1:].strip()
         
-        requirement = {
-            "text": line,
-            "id": None,
-            "priority": "medium",
-            "status": "pending",
-            "tags": [],
-            "assignee": None,
-            "inheritance": "inherit",
-            "original_text": line,
-            "markers": {},  # For composite markers
-            "categories": [],  # For categorization markers
-            "metrics": {}  # For metric markers
-        }
+        requirement = Requirement(line)
+        requirement.column = column
         
         # Check for REQ-XXX ID (including hierarchical dot notation)
-        id_match = re.match(r'^(REQ-\d+(?:\.\d+)*):\s*(.+)$', line)
+        id_match = self.req_id_pattern.match(line) if line.startswith('REQ-') else None
         if id_match:
-            requirement["id"] = id_match.group(1)
+            requirement.id = req_id = id_match.group(1)
             line = id_match.group(2)
-            requirement["text"] = line
+            requirement.text = line
             
             # Extract hierarchy info from dot notation
-            if '.' in requirement["id"]:
-                parts = requirement["id"].split('.')
-                requirement["parent_ref"] = '.'.join(parts[:-1])
-                requirement["hierarchy_level"] = len(parts) - 1
+            if '.' in req_id:
+                parts = req_id.split('.')
+                requirement.parent_ref = '.'.join(parts[:-1])
+                requirement.hierarchy_level = len(parts) - 1
             else:
-                requirement["hierarchy_level"] = 0
-        
-        # Check for inheritance markers
-        if line.startswith("[OVERRIDE]") or line.lower().startswith("modified:"):
-            requirement["inheritance"] = "override"
-            line = re.sub(r'^\[(OVERRIDE)\]|^modified:\s*', '', line, flags=re.IGNORECASE)
-            requirement["text"] = line.strip()
-        elif line.startswith("[NEW]") or line.lower().startswith("new:"):
-            requirement["inheritance"] = "new"
-            line = re.sub(r'^\[(NEW)\]|^new:\s*', '', line, flags=re.IGNORECASE)
-            requirement["text"] = line.strip()
-        elif line.startswith("[INHERIT]"):
-            requirement["inheritance"] = "inherit"
-            line = line.replace("[INHERIT]", "").strip()
-            requirement["text"] = line
+                requirement.hierarchy_level = 0
+        
+        # Check for inheritance markers, which all start with "[", "m" or "n"
+        if line[:1] in ('[', 'm', 'M', 'n', 'N'):
+            prefix = line[:9].lower()
+            if line.startswith("[OVERRIDE]") or prefix.startswith("modified:"):
+                requirement.inheritance = "override"
+                line = self.override_pattern.sub('', line)
+                requirement.text = line.strip()
+            elif line.startswith("[NEW]") or prefix.startswith("new:"):
+                requirement.inheritance = "new"
+                line = self.new_pattern.sub('', line)
+                requirement.text = line.strip()
+            elif line.startswith("[INHERIT]"):
+                requirement.inheritance = "inherit"
+                line = line.replace("[INHERIT]", "").strip()
+                requirement.text = line
             
         # Check for markers (both simple and composite)
         if line.startswith('['):
-            # Extract marker content between brackets
-            marker_match = re.match(r'^\[([^\]]+)\]\s*(.+)$', line)
+            marker_match = self.marker_block_pattern.match(line)
             if marker_match:
-                marker_content = marker_match.group(1)
-                text = marker_match.group(2)
-                requirement["text"] = text
-                
-                # Parse markers (check for composite, key:value, or code links)
-                if ('|' in marker_content or ':' in marker_content or 
-                    marker_content.startswith('↔') or marker_content.startswith('<->') or
-                    marker_content.startswith('→') or marker_content.startswith('->') or
-                    marker_content.startswith('←') or marker_content.startswith('<-')):
-                    self._parse_composite_markers(marker_content, requirement)
-                else:
-                    # Handle simple markers for backward compatibility
-                    self._parse_simple_marker(marker_content, requirement)
+                requirement.text = marker_match.group(2)
+                self.grammar.parse(marker_match.group(1), requirement)
+                if column is not None:
+                    # Every step above only drops a prefix, except a repeated [INHERIT]
+                    offset = (len(source_line) - len(line) if source_line.endswith(line)
+                              else source_line.find(line[:marker_match.end(1) + 1]))
+                    requirement.marker_column = column + offset
                     
         return requirement
-    
-    def _parse_simple_marker(self, marker: str, requirement: Dict[str, Any]):
-        """Parse a simple single marker."""
-        if marker == '!':
-            requirement["priority"] = "critical"
-        elif marker == '!!':
-            requirement["priority"] = "urgent"
-        elif marker == '~':
-            requirement["priority"] = "low"
-        elif marker == '?':
-            requirement["status"] = "uncertain"
-        elif marker == 'x':
-            requirement["status"] = "complete"
-        elif marker == ' ':
-            requirement["status"] = "pending"
-        elif marker.startswith('@'):
-            # Handle @user or @team-name
-            requirement["assignee"] = marker[1:]
-        elif marker.startswith('#'):
-            requirement["tags"].append(marker[1:])
-        else:
-            # Store as a general marker
-            requirement["markers"][marker] = True
-    
-    def _parse_composite_markers(self, marker_content: str, requirement: Dict[str, Any]):
-        """Parse composite markers separated by pipes."""
-        # Check if this is a code link first (before splitting)
-        if (marker_content.startswith('↔') or marker_content.startswith('<->') or
-            marker_content.startswith('→') or marker_content.startswith('->') or
-            marker_content.startswith('←') or marker_content.startswith('<-')):
-            # Treat entire content as a single code link component
-            if '|' in marker_content:
-                # Split but keep the first arrow part intact
-                first_pipe = marker_content.index('|')
-                components = [marker_content[:first_pipe].strip()] + marker_content[first_pipe+1:].split('|')
-            else:
-                components = [marker_content]
-        else:
-            components = marker_content.split('|')
-        
-        for component in components:
-            component = component.strip()
-            
-            # Skip empty components
-            if not component:
-                continue
-                
-            # Check for code links first
-            if component.startswith('↔'):
-                # Bidirectional code link (unicode arrow)
-                link_text = component[1:].strip()
-                self._parse_code_link(requirement, link_text)
-            elif component.startswith('<->'):
-                # Bidirectional code link (ASCII)
-                link_text = component[3:].strip()
-                self._parse_code_link(requirement, link_text)
-            elif component.startswith('→'):
-                # Forward code link (unicode arrow)
-                link_text = component[1:].strip()
-                self._parse_code_link(requirement, link_text, direction='forward')
-            elif component.startswith('->'):
-                # Forward code link (ASCII)
-                link_text = component[2:].strip()
-                self._parse_code_link(requirement, link_text, direction='forward')
-            elif component.startswith('←'):
-                # Backward code link (unicode arrow)
-                link_text = component[1:].strip()
-                self._parse_code_link(requirement, link_text, direction='backward')
-            elif component.startswith('<-'):
-                # Backward code link (ASCII)
-                link_text = component[2:].strip()
-                self._parse_code_link(requirement, link_text, direction='backward')
-            # Check for key:value pairs
-            elif ':' in component:
-                key, value = component.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                # Handle specific key types
-                if key in ['estimate', 'actual', 'variance']:
-                    requirement["metrics"][key] = value
-                elif key == 'progress':
-                    requirement["metrics"]["progress"] = value
-                elif key == 'coverage':
-                    requirement["metrics"]["coverage"] = value
-                elif key == 'confidence':
-                    requirement["metrics"]["confidence"] = value
-                elif key == 'sprint':
-                    requirement["markers"]["sprint"] = value
-                elif key == 'phase':
-                    requirement["markers"]["phase"] = value
-                elif key == 'milestone':
-                    requirement["markers"]["milestone"] = value
-                elif key == 'vendor':
-                    requirement["markers"]["vendor"] = value
-                elif key == 'eta':
-                    requirement["markers"]["eta"] = value
-                elif key == 'deployed':
-                    requirement["status"] = f"deployed:{value}"
-                elif key == 'stage':
-                    requirement["markers"]["stage"] = value
-                elif key == 'gap':
-                    requirement["markers"]["gap"] = value
-                elif key == 'review':
-                    requirement["markers"]["review"] = value
-                elif key == 'depends':
-                    requirement["markers"]["depends"] = value
-                elif key == 'blocks':
-                    requirement["markers"]["blocks"] = value
-                elif key == 'after':
-                    requirement["markers"]["after"] = value
-                elif key == 'parallel':
-                    requirement["markers"]["parallel"] = value
-                else:
-                    # Store generic key:value
-                    requirement["markers"][key] = value
-            else:
-                # Handle non key:value components
-                if component in ['!', '!!', '~']:
-                    # Priority markers
-                    if component == '!':
-                        requirement["priority"] = "critical"
-                    elif component == '!!':
-                        requirement["priority"] = "urgent"
-                    elif component == '~':
-                        requirement["priority"] = "low"
-                elif component.startswith('@'):
-                    # Assignment markers
-                    assignee = component[1:]
-                    if assignee.startswith('team-'):
-                        requirement["assignee"] = assignee
-                    elif assignee.startswith('role:'):
-                        requirement["assignee"] = assignee
-                    else:
-                        requirement["assignee"] = assignee
-                elif component.startswith('#'):
-                    # Tag markers
-                    requirement["tags"].append(component[1:])
-                elif component in ['blocked', 'testing', 'review', 'complete', 'pending']:
-                    # Status markers
-                    requirement["status"] = component
-                elif component in ['security', 'performance', 'ui', 'api', 'database']:
-                    # Category markers
-                    requirement["categories"].append(component)
-                elif component in ['mvp', 'tested', 'deployed', 'external']:
-                    # Boolean flag markers
-                    requirement["markers"][component] = True
-                else:
-                    # Store as generic marker
-                    requirement["markers"][component] = True
-    
-    def _parse_code_link(self, requirement: Dict[str, Any], link_text: str, direction: str = 'bidirectional'):
-        """Parse code link and add to requirement."""
-        if "code_links" not in requirement:
-            requirement["code_links"] = []
-        
-        # Parse link format: file.ext:line or file.ext:start-end
-        parts = link_text.split(':')
-        if len(parts) >= 2:
-            file_path = parts[0].strip()
-            line_spec = ':'.join(parts[1:]).strip()
-            
-            # Parse line specification
-            if '-' in line_spec:
-                # Range format: 45-67
-                line_parts = line_spec.split('-')
-                start_line = line_parts[0].strip()
-                end_line = line_parts[1].strip() if len(line_parts) > 1 else start_line
-                
-                requirement["code_links"].append({
-                    "file": file_path,
-                    "start_line": start_line,
-                    "end_line": end_line,
-                    "direction": direction,
-                    "raw": link_text
-                })
-            else:
-                # Single line format: 45
-                requirement["code_links"].append({
-                    "file": file_path,
-                    "line": line_spec,
-                    "direction": direction,
-                    "raw": link_text
-                })
-        else:
-            # Just file path, no line numbers
-            requirement["code_links"].append({
-                "file": link_text.strip(),
-                "direction": direction,
-                "raw": link_text
-            })
+
+
+# Parser used by parse_many worker processes
+_worker_parser = None
+
+
+def _init_parse_worker(parser: MSLParser):
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _parse_in_worker(path: str) -> tuple[str, Optional[Dict[str, Any]], Optional[Exception]]:
+    path, result, error = _parse_with(_worker_parser, path)
+    if error is not None:
+        # The error travels back to the parent process, so it must pickle
+        try:
+            pickle.loads(pickle.dumps(error))
+        except Exception:
+            error = RuntimeError(f"{type(error).__name__}: {error}")
+    return path, result, error
+
+
+def _parse_with(parser: MSLParser, path: str) -> tuple[str, Optional[Dict[str, Any]], Optional[Exception]]:
+    try:
+        return path, parser.parse_file(path), None
+    except Exception as e:
+        return path, None, e
 
 
 class MSLLevel:
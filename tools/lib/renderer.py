@@ -1,20 +1,70 @@
 """MSL Renderer - Render MSL documents with templates and variables."""
 
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, Any, Optional
 import re
 
 
+@lru_cache(maxsize=64)
+def _variable_pattern(names: tuple) -> "re.Pattern":
+    """Match ``${name}`` or ``$name`` (not followed by a word character) for any of ``names``.
+    
+    An empty name only matches as ``${}``, not as every lone ``$``.
+    """
+    names = sorted(names, key=len, reverse=True)
+    braced = "|".join(map(re.escape, names))
+    bare = "|".join(re.escape(name) for name in names if name) or "(?!)"
+    return re.compile(rf"\$(?:\{{({braced})\}}|({bare})(?!\w))")
+
+
+def substitute_variables(content: str, variables: Dict[str, Any]) -> str:
+    """Replace every ``${name}`` and ``$name`` of a variable with its value, in one pass.
+    
+    Values are inserted as ``str(value)`` and are not themselves substituted.
+    """
+    if not variables:
+        return content
+    values = {str(key): value for key, value in variables.items()}
+    pattern = _variable_pattern(tuple(values))
+    
+    def replace(match):
+        name = match.group(1) if match.group(1) is not None else match.group(2)
+        return str(values[name])
+    return pattern.sub(replace, content)
+
+
 class MSLRenderer:
-    """Render MSL documents with variable substitution."""
+    """Render MSL documents with variable substitution.
+    
+    With Jinja2 installed, templates are compiled by one ``Environment``
+    owned by the renderer and kept by their content, so rendering the same
+    content again only runs the compiled template. ``max_templates`` bounds
+    how many are kept, dropping the least recently used. ``bytecode_cache``
+    names a directory where compiled templates are also stored between
+    runs, keyed by a hash of their content.
+    """
     
-    def __init__(self):
+    def __init__(self, max_templates: Optional[int] = 128, bytecode_cache: Optional[str] = None):
         self.jinja2_available = False
+        self.max_templates = max_templates
+        self._templates = OrderedDict()  # content -> compiled template
+        self._env = None
         try:
             import jinja2
             self.jinja2_available = True
         except ImportError:
             pass
             
+        if self.jinja2_available:
+            bcc = None
+            if bytecode_cache is not None:
+                Path(bytecode_cache).mkdir(parents=True, exist_ok=True)
+                bcc = jinja2.FileSystemBytecodeCache(str(bytecode_cache))
+            self._env = jinja2.Environment(bytecode_cache=bcc)
+            
     def render(self, content: str, variables: Dict[str, Any]) -> str:
         """Render content with variable substitution."""
         if self.jinja2_available:
@@ -24,21 +74,42 @@ class MSLRenderer:
             
     def _render_jinja2(self, content: str, variables: Dict[str, Any]) -> str:
         """Render using Jinja2 if available."""
-        import jinja2
-        template = jinja2.Template(content)
-        return template.render(**variables)
+        return self._template(content).render(**variables)
+    
+    def _template(self, content: str):
+        """Return the compiled template for ``content``, compiling it on first use."""
+        template = self._templates.get(content)
+        if template is not None:
+            self._templates.move_to_end(content)
+            return template
+            
+        # As a Jinja2 loader would, but for templates that have no name
+        env = self._env
+        bcc = env.bytecode_cache
+        code = None
+        if bcc is not None:
+            key = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            bucket = bcc.get_bucket(env, key, None, content)
+            code = bucket.code
+        if code is None:
+            code = env.compile(content)
+            if bcc is not None:
+                bucket.code = code
+                try:
+                    bcc.set_bucket(bucket)
+                except OSError:
+                    pass
+        template = env.template_class.from_code(env, code, env.make_globals(None), None)
+        
+        self._templates[content] = template
+        if self.max_templates is not None:
+            while len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+        return template
         
     def _render_simple(self, content: str, variables: Dict[str, Any]) -> str:
         """Simple variable substitution without Jinja2."""
-        result = content
-        
-        for key, value in variables.items():
-            # Replace ${variable} syntax
-            result = result.replace(f"${{{key}}}", str(value))
-            # Also replace $variable syntax
-            result = re.sub(rf'\${key}\b', str(value), result)
-            
-        return result
+        return substitute_variables(content, variables)
         
     def render_parsed(self, parsed: Dict[str, Any]) -> str:
         """Render a parsed MSL document back to markdown."""
@@ -0,0 +1,209 @@
+"""MSL Requirement - Compact storage for parsed requirements."""
+
+import sys
+from collections.abc import MutableMapping
+from typing import Dict, Any, Iterator, List
+
+
+class _Missing:
+    """Marker for a key that is absent from a requirement."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __reduce__(self):
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+# Keys in the order the parser has always produced them
+FIELDS = (
+    "text", "id", "priority", "status", "tags", "assignee", "inheritance",
+    "original_text", "markers", "categories", "metrics", "parent_ref",
+    "hierarchy_level", "code_links", "depth", "parent_id", "children",
+)
+
+# Containers are allocated on first access; until then the slot holds None
+CONTAINERS = {"tags": list, "markers": dict, "categories": list, "metrics": dict, "children": list}
+
+# Values repeated across a corpus are interned when stored
+INTERNED = frozenset(["priority", "status", "assignee", "inheritance"])
+
+_SLOTS = {name: ("_" + name if name in CONTAINERS else name) for name in FIELDS}
+_FIELD_SLOTS = tuple(_SLOTS.values())
+
+
+class Requirement(MutableMapping):
+    """A parsed requirement stored in slots instead of a dictionary.
+
+    Behaves like the dictionaries the parser used to return: ``req["text"]``,
+    ``req.get("markers", {})``, ``"code_links" in req``, ``copy()`` and
+    ``update()`` all work, and unknown keys are kept in a small side dictionary.
+    Empty ``tags``, ``markers``, ``categories``, ``metrics`` and ``children``
+    cost nothing until they are read or written.
+
+    ``line`` and ``column`` are the 1-based source position of the requirement's
+    leading ``-``, and ``marker_column`` that of its ``[...]`` marker block, if
+    any. They are attributes only and not mapping keys.
+    """
+
+    __slots__ = (
+        "text", "id", "priority", "status", "assignee", "inheritance", "original_text",
+        "parent_ref", "hierarchy_level", "code_links", "depth", "parent_id", "line",
+        "column", "marker_column", "_tags", "_markers", "_categories", "_metrics", "_children", "_extra",
+    )
+
+    def __init__(self, text: str = ""):
+        self.text = text
+        self.id = None
+        self.priority = "medium"
+        self.status = "pending"
+        self.assignee = None
+        self.inheritance = "inherit"
+        self.original_text = text
+        self.parent_ref = MISSING
+        self.hierarchy_level = MISSING
+        self.code_links = MISSING
+        self.depth = 0
+        self.parent_id = None
+        self.line = None
+        self.column = None
+        self.marker_column = None
+        self._tags = None
+        self._markers = None
+        self._categories = None
+        self._metrics = None
+        self._children = None
+        self._extra = None
+
+    @property
+    def tags(self) -> List[str]:
+        return self["tags"]
+
+    @property
+    def markers(self) -> Dict[str, Any]:
+        return self["markers"]
+
+    @property
+    def categories(self) -> List[str]:
+        return self["categories"]
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        return self["metrics"]
+
+    @property
+    def children(self) -> List["Requirement"]:
+        return self["children"]
+
+    def __getitem__(self, key: str) -> Any:
+        slot = _SLOTS.get(key)
+        if slot is None:
+            if self._extra is not None and key in self._extra:
+                return self._extra[key]
+            raise KeyError(key)
+
+        value = getattr(self, slot)
+        if value is MISSING:
+            raise KeyError(key)
+        if value is None and key in CONTAINERS:
+            value = CONTAINERS[key]()
+            setattr(self, slot, value)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        slot = _SLOTS.get(key)
+        if slot is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+            return
+
+        if key in INTERNED and type(value) is str:
+            value = sys.intern(value)
+        setattr(self, slot, value)
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        if key in _SLOTS:
+            setattr(self, _SLOTS[key], MISSING)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        slot = _SLOTS.get(key)
+        if slot is None:
+            return self._extra is not None and key in self._extra
+        return getattr(self, slot) is not MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if getattr(self, _SLOTS[key]) is not MISSING:
+                yield key
+        if self._extra:
+            yield from list(self._extra)
+
+    def __len__(self) -> int:
+        count = sum(1 for key in FIELDS if getattr(self, _SLOTS[key]) is not MISSING)
+        return count + (len(self._extra) if self._extra else 0)
+
+    def __repr__(self):
+        return f"Requirement({dict(self)!r})"
+
+    # State is a tuple in __slots__ order, spelled out because unpickling
+    # results from worker processes is on the parent's critical path
+    def __getstate__(self):
+        return (self.text, self.id, self.priority, self.status, self.assignee, self.inheritance,
+                self.original_text, self.parent_ref, self.hierarchy_level, self.code_links,
+                self.depth, self.parent_id, self.line, self.column, self.marker_column,
+                self._tags, self._markers, self._categories, self._metrics, self._children,
+                self._extra)
+
+    def __setstate__(self, state):
+        (self.text, self.id, self.priority, self.status, self.assignee, self.inheritance,
+         self.original_text, self.parent_ref, self.hierarchy_level, self.code_links,
+         self.depth, self.parent_id, self.line, self.column, self.marker_column,
+         self._tags, self._markers, self._categories, self._metrics, self._children,
+         self._extra) = state
+
+    def copy(self) -> "Requirement":
+        """Return a shallow copy, sharing containers like ``dict.copy``."""
+        clone = Requirement.__new__(Requirement)
+        clone.__setstate__(self.__getstate__())
+        if self._extra is not None:
+            clone._extra = dict(self._extra)
+        return clone
+
+    def update(self, other=(), /, **kwargs):
+        """Like ``dict.update``; another Requirement is copied slot by slot."""
+        if type(other) is not Requirement or kwargs:
+            return super().update(other, **kwargs)
+        for slot in _FIELD_SLOTS:
+            value = getattr(other, slot)
+            if value is not MISSING:
+                setattr(self, slot, value)
+        if other._extra:
+            if self._extra is None:
+                self._extra = {}
+            self._extra.update(other._extra)
+
+    def walk(self) -> Iterator["Requirement"]:
+        """Yield this requirement and all of its descendants, depth first."""
+        stack = [self]
+        while stack:
+            req = stack.pop()
+            yield req
+            if req._children:
+                stack.extend(reversed(req._children))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to plain dictionaries, recursing into children."""
+        result = dict(self)
+        if result.get("children"):
+            result["children"] = [child.to_dict() if isinstance(child, Requirement) else child
+                                  for child in result["children"]]
+        return result
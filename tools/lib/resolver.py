@@ -1,50 +1,1132 @@
 """MSL Resolver - Resolve inheritance chains in MSL documents."""
 
-from typing import Dict, Any, List, Optional
+import hashlib
+import os
+from collections import ChainMap, OrderedDict, deque
+from typing import Dict, Any, Iterable, Iterator, List, Mapping, Optional, Sequence, Set
 from pathlib import Path
-from .parser import MSLParser
+from .cache import ParseCache
+from .config import ResolverConfig
+from .parser import LazyDocument, MSLParser, PARSER_VERSION
+from .requirement import Requirement
+
+
+# Bump whenever resolved results for the same files change, to invalidate caches
+RESOLVER_VERSION = "1"
+
+# Marks specs without ``extends``; None is a valid (if odd) parent ID
+_NO_EXTENDS = object()
+
+
+def _children_of(req) -> Sequence:
+    """Return a requirement's children without allocating a list for none."""
+    if type(req) is Requirement:
+        return req._children or ()
+    return req.get("children") or ()
+
+
+class _Layer:
+    """Requirements by ID as one level of a chain sees them: its own entries over its parent's.
+    
+    Together the layers form the ``parent_by_id`` mapping a child is merged
+    against, without copying it at every level. ``patches`` replace parent
+    entries in place, for edits below them.
+    """
+    
+    __slots__ = ("entries", "patches", "base", "depth", "_paths", "_nested")
+    
+    # Layers deeper than this are flattened, so lookups stay cheap on long chains
+    MAX_DEPTH = 32
+    
+    def __init__(self, entries: Dict[str, Any], base: Optional["_Layer"] = None,
+                 patches: Optional[Dict[str, Any]] = None):
+        self.entries = entries
+        self.patches = patches or {}
+        self.base = base
+        self.depth = base.depth + 1 if base is not None else 0
+        self._paths = None
+        self._nested = None
+        
+    def get(self, req_id) -> Optional[Any]:
+        layer = self
+        while layer is not None:
+            req = layer.entries.get(req_id)
+            if req is None:
+                req = layer.patches.get(req_id)
+            if req is not None:
+                return req
+            layer = layer.base
+        return None
+    
+    def items(self) -> Iterator[tuple]:
+        """Yield (id, requirement) in the order of the merged mapping."""
+        if self.base is None:
+            yield from self.entries.items()
+            return
+        seen = set()
+        patched = {}
+        layer = self
+        while layer is not None:
+            for req_id, req in layer.patches.items():
+                patched.setdefault(req_id, req)
+            for req_id, req in layer.entries.items():
+                if req_id not in seen:
+                    seen.add(req_id)
+                    yield req_id, patched.get(req_id, req)
+            layer = layer.base
+            
+    def find(self, req_id, nested_only: bool = False) -> Optional[tuple]:
+        """Return the IDs from the top level down to requirement ``req_id`` at any depth, or None.
+        
+        ``nested_only`` skips the top level, for callers that just looked there.
+        """
+        if not nested_only and self.get(req_id) is not None:
+            return (req_id,)
+        if not self.has_nested():
+            return None
+        layer = self
+        while layer is not None:
+            paths = layer._paths if layer._paths is not None else layer._index()
+            path = paths.get(req_id)
+            # Only valid if no layer above replaced the subtree it was found in
+            if path is not None and layer._top(path[0]) is self.get(path[0]):
+                return path
+            layer = layer.base
+        return None
+    
+    def locate(self, path: tuple) -> tuple[Optional[Any], List[Any]]:
+        """Return the requirement at ``path`` and the requirements above it."""
+        req = self.get(path[0])
+        ancestors = []
+        for req_id in path[1:]:
+            ancestors.append(req)
+            req = next((child for child in _children_of(req) if child.get("id") == req_id), None)
+            if req is None:
+                return None, []
+        return req, ancestors
+    
+    def has_nested(self) -> bool:
+        """Return whether any requirement seen through this layer has children."""
+        if self._nested is None:
+            self._nested = bool(self._index()) or (self.base is not None and self.base.has_nested())
+        return self._nested
+    
+    def flattened(self) -> "_Layer":
+        return self if self.base is None else _Layer(dict(self.items()))
+    
+    def _top(self, req_id) -> Optional[Any]:
+        req = self.entries.get(req_id)
+        return req if req is not None else self.patches.get(req_id)
+    
+    def _index(self) -> Dict[str, tuple]:
+        """Paths to the nested requirements of this layer's own entries, built on first use."""
+        if self._paths is None:
+            paths = {}
+            for top_id, top in (*self.entries.items(), *self.patches.items()):
+                stack = [((top_id,), child) for child in reversed(_children_of(top))]
+                while stack:
+                    path, req = stack.pop()
+                    req_id = req.get("id")
+                    if req_id:
+                        path += (req_id,)
+                        paths.setdefault(req_id, path)
+                        stack.extend((path, child) for child in reversed(_children_of(req)))
+            self._paths = paths
+        return self._paths
+
+
+class MergedRequirements(Sequence):
+    """The requirements of a resolved spec, sharing its parent's by reference.
+    
+    Holds the spec's own requirements (with inherited ones already merged
+    in), edits to inherited requirements made below the top level, and the
+    parent's requirements by ID, and builds the combined list the first
+    time it is indexed. Merging a child therefore costs time and memory in
+    proportion to the child, not to everything it inherits.
+    
+    Read-only; ``list()`` gives a plain, mutable copy. Pickles as a list.
+    """
+    
+    __slots__ = ("_head", "_parent", "_used", "_patches", "_layer", "_list")
+    
+    def __init__(self, head: List[Any], parent: Optional[_Layer] = None, used: Set[str] = frozenset(),
+                 patches: Optional[Dict[str, Any]] = None):
+        self._head = head
+        self._parent = parent
+        self._used = used
+        self._patches = patches or {}
+        self._layer = None
+        self._list = None if parent is not None else head
+        
+    def layer(self) -> _Layer:
+        """Return these requirements by ID, as a parent for the next level."""
+        if self._layer is None:
+            # First position, last value, like a dict built from the list
+            entries = {}
+            for req in self._head:
+                req_id = req.get("id")
+                if req_id:
+                    entries[req_id] = req
+            parent = self._parent
+            if parent is not None:
+                for req_id in entries:
+                    if req_id not in self._used:
+                        inherited = self._patches.get(req_id)
+                        if inherited is None:
+                            inherited = parent.get(req_id)
+                        if inherited is not None:
+                            entries[req_id] = inherited
+            layer = _Layer(entries, parent, self._patches)
+            if layer.depth > _Layer.MAX_DEPTH:
+                layer = layer.flattened()
+            self._layer = layer
+        return self._layer
+    
+    def __iter__(self) -> Iterator[Any]:
+        if self._list is not None:
+            return iter(self._list)
+        return self._iter()
+    
+    def _iter(self) -> Iterator[Any]:
+        yield from self._head
+        used = self._used
+        patches = self._patches
+        for req_id, req in self._parent.items():
+            if req_id not in used:
+                yield patches.get(req_id, req)
+                
+    def _items(self) -> List[Any]:
+        if self._list is None:
+            self._list = list(self._iter())
+        return self._list
+    
+    def __getitem__(self, index):
+        return self._items()[index]
+    
+    def __len__(self) -> int:
+        return len(self._items())
+    
+    def __eq__(self, other):
+        if isinstance(other, MergedRequirements):
+            other = other._items()
+        elif not isinstance(other, list):
+            return NotImplemented
+        return self._items() == other
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"MergedRequirements({self._items()!r})"
+    
+    def __reduce__(self):
+        return list, (self._items(),)
+
+
+class ResolvedView(Mapping):
+    """A resolved spec whose fields are merged from its inheritance chain when read.
+    
+    ``docs`` run from the spec itself up to its root, or up to the nearest
+    ancestor already resolved. ``metadata`` is a ``ChainMap`` over their
+    metadata; ``title``, ``summary`` and ``notes`` come from the nearest spec
+    that has them; ``requirements`` are merged the first time they are read.
+    Other keys, such as ``source``, are the root's as in ``resolve``'s
+    results. Values equal what ``resolve`` returns, provided the files do
+    not change in between.
+    """
+    
+    OWN_KEYS = frozenset(["title", "summary", "notes"])
+    
+    __slots__ = ("_resolver", "_docs", "_values")
+    
+    def __init__(self, resolver: "MSLResolver", docs: List[Mapping]):
+        self._resolver = resolver
+        self._docs = docs
+        self._values = {}
+        
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        root = self._docs[-1]
+        if key == "metadata":
+            value = ChainMap(*(doc.get("metadata", {}) for doc in self._docs))
+        elif key in self.OWN_KEYS:
+            value = next((doc[key] for doc in self._docs[:-1] if doc.get(key)), root[key])
+        elif key == "requirements":
+            value = root.get("requirements", [])
+            if not isinstance(value, MergedRequirements):
+                value = MergedRequirements(value)
+            for doc in reversed(self._docs[:-1]):
+                value = self._resolver._merge_requirements(value, doc.get("requirements", []))
+        else:
+            value = root[key]
+        self._values[key] = value
+        return value
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._docs[-1])
+    
+    def __len__(self) -> int:
+        return len(self._docs[-1])
+    
+    def __repr__(self):
+        return f"ResolvedView({self._docs[0]['source']!r})"
+    
+    def __reduce__(self):
+        # Pickles as the fully resolved dictionary
+        return dict, ({key: dict(value) if key == "metadata" else value for key, value in self.items()},)
+    
+    def requirement(self, req_id: str) -> Optional[Requirement]:
+        """Return the merged requirement with an ID at any depth, or None."""
+        layer = self["requirements"].layer()
+        path = layer.find(req_id)
+        return layer.locate(path)[0] if path is not None else None
+
+
+class _TreeMerge:
+    """Matches a child's requirements against its parent's at any depth.
+    
+    ``collect`` walks the child's tree once, matching each requirement to
+    the parent requirement with its ID among the corresponding siblings or,
+    failing that, anywhere in the parent's tree. ``build`` and ``retain``
+    then produce the merged requirements, copying only parent requirements
+    that are edited or lie above an edit.
+    """
+    
+    MATCHING = ("override", "inherit")
+    
+    def __init__(self, parent: _Layer):
+        self.parent = parent
+        self.matched = {}    # id() of child requirement -> parent requirement among its siblings
+        self.edits = {}      # id() of parent requirement -> child requirement applied in place
+        self.moved = set()   # id() of child requirements applied in place elsewhere
+        self.claimed = set() # id() of parent requirements matched so far
+        self.on_path = set() # id() of parent requirements above an edit
+        self.tops = {}       # top-level ID -> parent requirement containing an edit
+        
+    def collect(self, reqs: Sequence, siblings, top: bool = False):
+        for req in reqs:
+            inheritance = req.get("inheritance", "inherit")
+            if inheritance == "new":
+                # Added as written, nothing inside is matched
+                continue
+            req_id = req.get("id")
+            children = _children_of(req)
+            if not req_id or inheritance not in self.MATCHING:
+                if children:
+                    self.collect(children, {})
+                continue
+                
+            # Top-level matches may repeat, as they always could
+            target = siblings.get(req_id)
+            if target is not None and (top or id(target) not in self.claimed):
+                self.claimed.add(id(target))
+                self.matched[id(req)] = target
+                self._collect_below(req, target, inheritance)
+                continue
+                
+            path = self.parent.find(req_id, nested_only=top)
+            target, ancestors = self.parent.locate(path) if path else (None, [])
+            if target is not None and id(target) not in self.claimed:
+                self.claimed.add(id(target))
+                self.edits[id(target)] = req
+                self.moved.add(id(req))
+                self.on_path.update(id(ancestor) for ancestor in ancestors)
+                self.tops.setdefault(path[0], ancestors[0] if ancestors else target)
+                self._collect_below(req, target, inheritance)
+            elif children:
+                self.collect(children, {})
+                
+    def _collect_below(self, req, target, inheritance: str):
+        """Match the children of ``req``, which was matched to ``target``."""
+        children = _children_of(req)
+        if inheritance == "override":
+            # The parent's subtree is replaced, so nothing in it can be matched
+            stack = list(_children_of(target))
+            while stack:
+                node = stack.pop()
+                self.claimed.add(id(node))
+                stack.extend(_children_of(node))
+            if children:
+                self.collect(children, {})
+        elif children:
+            self.collect(children, self._by_id(_children_of(target)))
+            
+    def build(self, target, req, top: bool = False):
+        """Return child requirement ``req`` applied to parent requirement ``target``, in its place.
+        
+        An ``[OVERRIDE]`` replaces ``target`` with its children; otherwise
+        the children are merged with the parent's. ``top`` says both are
+        top-level requirements, so already in the same place.
+        """
+        if req.get("inheritance", "inherit") == "override":
+            merged = self.written(req)
+            children = _children_of(merged)
+        else:
+            merged = target.copy()
+            merged.update(req)
+            children = _children_of(merged)
+            parent_children = _children_of(target)
+            if parent_children or self.moved:
+                children = self.merge_children(parent_children, _children_of(req))
+                
+        changes = {}
+        if not top:
+            for key in ("depth", "parent_id"):
+                if key in target and merged.get(key) != target[key]:
+                    changes[key] = target[key]
+            if "depth" in changes:
+                children = [self._at_depth(child, changes["depth"] + 1) for child in children]
+        current = _children_of(merged)
+        if children is not current and (len(children) != len(current)
+                                        or any(a is not b for a, b in zip(children, current))):
+            changes["children"] = children
+        if changes:
+            if merged is req:
+                merged = req.copy()
+            merged.update(changes)
+        return merged
+    
+    def merge_children(self, parent_children: Sequence, children: Sequence) -> List[Any]:
+        """Merge a child's list of requirements into the parent's, like the top level."""
+        by_id = self._by_id(parent_children)
+        result = []
+        used = set()
+        for req in children:
+            if id(req) in self.moved:
+                continue
+            target = self.matched.get(id(req))
+            if target is not None:
+                result.append(self.build(target, req))
+                used.add(req.get("id"))
+            else:
+                result.append(self.written(req))
+        result.extend(self.retain(req) for req_id, req in by_id.items() if req_id not in used)
+        return result
+    
+    def written(self, req):
+        """Return an unmatched child requirement as written, less anything applied elsewhere."""
+        children = _children_of(req)
+        if not children or not self.moved:
+            return req
+        kept = [self.written(child) for child in children if id(child) not in self.moved]
+        if len(kept) == len(children) and all(a is b for a, b in zip(kept, children)):
+            return req
+        req = req.copy()
+        req["children"] = kept
+        return req
+    
+    def retain(self, req):
+        """Return an inherited requirement with the edits below it applied."""
+        edit = self.edits.get(id(req))
+        if edit is not None:
+            return self.build(req, edit)
+        if id(req) not in self.on_path:
+            return req
+        req = req.copy()
+        req["children"] = [self.retain(child) for child in _children_of(req)]
+        return req
+    
+    @staticmethod
+    def _at_depth(req, depth: int):
+        """Return ``req`` with its subtree moved to ``depth``, copying only what moves."""
+        if req.get("depth", depth) == depth:
+            return req
+        req = req.copy()
+        req["depth"] = depth
+        children = _children_of(req)
+        if children:
+            req["children"] = [_TreeMerge._at_depth(child, depth + 1) for child in children]
+        return req
+    
+    @staticmethod
+    def _by_id(reqs: Sequence) -> Dict[str, Any]:
+        return {req["id"]: req for req in reqs if req.get("id")}
+
+
+class SpecIndex:
+    """Index of the spec files under search roots, by file name and frontmatter ``id``.
+    
+    Lookups prefer the locations the resolver has always probed, in order:
+    ``<id>.md``, ``<id>.msl``, ``specs/<id>.md`` and ``templates/<id>.md``
+    under a root. After those come files whose frontmatter declares the
+    ``id``, then files named ``<id>.md`` or ``<id>.msl`` anywhere in a tree.
+    Frontmatter is only read once a lookup gets that far, and only the
+    header of each file.
+    
+    The roots are the base directory followed by ``search_paths``, all
+    spelled relative to ``base_path`` as it is given, so a root inside
+    another is indexed as part of that tree. All of them share one table,
+    in which a match of an earlier kind in any root wins and, between
+    matches of the same kind, earlier roots shadow later ones. So
+    ``templates/<id>.md`` in a shared package is preferred over a file of
+    that name somewhere else in the base tree.
+    
+    The trees are scanned on first use. When a lookup misses, directories
+    whose mtime changed are rescanned and the miss is remembered until a
+    rescan finds a change, so a repeated miss only costs a stat of each
+    directory. ``refresh()`` checks for changes explicitly.
+    """
+    
+    SUFFIXES = (".md", ".msl")
+    
+    # Ranks of the file name keys; lower ranks win
+    RANK_MD, RANK_MSL, RANK_SPECS, RANK_TEMPLATES, RANK_ANYWHERE = 0, 1, 2, 3, 5
+    
+    def __init__(self, base_path: str = ".", parser: Optional[MSLParser] = None,
+                 search_paths: Sequence[str] = ()):
+        self.base_path = Path(base_path)
+        self.search_paths = [Path(path) for path in search_paths]
+        self.parser = parser or MSLParser(keep_raw_content=False)
+        self._roots = list(dict.fromkeys(self._spell(path) for path in (self.base_path, *self.search_paths)))
+        self._dirs: Optional[Dict[str, int]] = None     # directory -> mtime when scanned
+        self._names: Dict[str, Dict[str, int]] = {}      # key -> {path: rank}
+        self._file_keys: Dict[str, List[str]] = {}       # path -> its name keys
+        self._ids: Dict[str, Set[str]] = {}              # frontmatter id -> paths
+        self._file_ids: Dict[str, tuple] = {}            # path -> (mtime, frontmatter id)
+        self._unread: Set[str] = set()                   # paths whose frontmatter is not read yet
+        self._ids_wanted = False
+        self._missing: Set[str] = set()
+        
+    def find(self, spec_id: str) -> Optional[Path]:
+        """Return the file for a spec ID, or None."""
+        path = self._find(spec_id)
+        return Path(path) if path is not None else None
+    
+    def paths(self) -> List[str]:
+        """Return every indexed spec file, first rescanning directories that changed."""
+        if not self._load():
+            self.refresh()
+        return list(self._file_keys)
+    
+    def _spell(self, path) -> str:
+        """Spell a path as indexed paths are: absolute if ``base_path`` is, otherwise relative."""
+        path = os.path.abspath(path)
+        base = str(self.base_path)
+        if os.path.isabs(base):
+            return path
+        try:
+            relative = os.path.relpath(path, os.path.abspath(base))
+        except ValueError:
+            # On another drive
+            return path
+        return os.path.normpath(os.path.join(base, relative))
+    
+    def _find(self, spec_id: str) -> Optional[str]:
+        spec_id = str(spec_id)
+        self._load()
+        path = self._lookup(spec_id)
+        if path is None:
+            # A change clears the remembered misses, so they are looked up again
+            self.refresh()
+            if spec_id not in self._missing:
+                path = self._lookup(spec_id) or self._probe(spec_id)
+                if path is None:
+                    self._missing.add(spec_id)
+        return path
+    
+    def _load(self) -> bool:
+        """Scan the tree if it was not scanned yet; return whether it was just scanned."""
+        if self._dirs is not None:
+            return False
+        self._dirs = {}
+        for root in self._roots:
+            if root not in self._dirs:
+                self._scan(root)
+        return True
+    
+    def refresh(self) -> bool:
+        """Rescan directories that changed since they were scanned; return whether any did."""
+        if self._dirs is None:
+            return False
+        changed = False
+        for directory, mtime in list(self._dirs.items()):
+            if directory not in self._dirs:
+                continue  # removed along with a changed parent
+            try:
+                current = os.stat(directory).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime:
+                changed = True
+                self._rescan(directory)
+        if changed:
+            self._missing.clear()
+        return changed
+    
+    def _lookup(self, spec_id: str) -> Optional[str]:
+        path = self._best(spec_id, self.RANK_TEMPLATES)
+        if path is not None:
+            return path
+            
+        # Frontmatter IDs, read the first time a lookup gets here
+        self._ids_wanted = True
+        self._read_ids()
+        for path in sorted(self._ids.get(spec_id, ()), key=lambda path: (self._root_of(path), path)):
+            if self._check_id(path) == spec_id:
+                return path
+                
+        return self._best(spec_id, self.RANK_ANYWHERE)
+    
+    def _best(self, key: str, max_rank: int) -> Optional[str]:
+        paths = self._names.get(key)
+        if not paths:
+            return None
+        (rank, _), path = min((rank, path) for path, rank in paths.items())
+        return path if rank <= max_rank else None
+    
+    def _probe(self, spec_id: str) -> Optional[str]:
+        """Check the original candidate paths, for IDs the index cannot hold (e.g. ``../base``)."""
+        for root in self._roots:
+            prefix = "" if root == "." else root + os.sep
+            for path in (f"{prefix}{spec_id}.md",
+                         f"{prefix}{spec_id}.msl",
+                         f"{prefix}specs{os.sep}{spec_id}.md",
+                         f"{prefix}templates{os.sep}{spec_id}.md"):
+                # Files in directories that were just scanned would be indexed
+                directory, name = os.path.split(path)
+                if ((directory or ".") in self._dirs and not name.startswith('.')
+                        and os.path.normpath(path) == path):
+                    continue
+                if os.path.exists(path):
+                    return self._spell(path)
+        return None
+    
+    def _scan(self, top: str):
+        """Index every spec file under ``top``, skipping hidden entries and linked dirs."""
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            try:
+                # The mtime is taken first so that changes during the scan are seen later
+                mtime = os.stat(directory).st_mtime_ns
+                with os.scandir(directory) as entries:
+                    entries = list(entries)
+            except OSError:
+                continue
+            self._dirs[directory] = mtime
+            # Paths are spelled as root / name would be, without a leading "./"
+            prefix = "" if directory == "." else directory + os.sep
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                path = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if path not in self._dirs:
+                        stack.append(path)
+                elif entry.name.endswith(self.SUFFIXES) and entry.is_file():
+                    self._add_file(path)
+                    
+    def _rescan(self, directory: str):
+        """Drop what was indexed directly in ``directory`` and scan it again."""
+        for path in [path for path in self._file_keys if (os.path.dirname(path) or ".") == directory]:
+            self._remove_file(path)
+        prefix = "" if directory == "." else directory + os.sep
+        for subdirectory in [d for d in self._dirs if d != directory and d.startswith(prefix)]:
+            if not os.path.isdir(subdirectory):
+                del self._dirs[subdirectory]
+                for path in [path for path in self._file_keys if path.startswith(subdirectory + os.sep)]:
+                    self._remove_file(path)
+        del self._dirs[directory]
+        self._scan(directory)
+        
+    def _add_file(self, path: str):
+        keys = []
+        for order, root in enumerate(self._roots):
+            if not self._contains(root, path):
+                continue
+            relative = os.path.relpath(path, root).replace(os.sep, '/')
+            name, suffix = os.path.splitext(relative)
+            keys.append((name, (self.RANK_MD if suffix == ".md" else self.RANK_MSL, order)))
+            folder, _, rest = name.partition('/')
+            if suffix == ".md" and rest:
+                if folder == "specs":
+                    keys.append((rest, (self.RANK_SPECS, order)))
+                elif folder == "templates":
+                    keys.append((rest, (self.RANK_TEMPLATES, order)))
+            keys.append((name.rsplit('/', 1)[-1], (self.RANK_ANYWHERE, order)))
+            
+        for key, rank in keys:
+            paths = self._names.setdefault(key, {})
+            paths[path] = min(rank, paths.get(path, rank))
+        self._file_keys[path] = [key for key, _ in keys]
+        self._unread.add(path)
+        if self._ids_wanted:
+            # New files may declare IDs that were looked up before
+            self._read_ids()
+            
+    def _remove_file(self, path: str):
+        for key in self._file_keys.pop(path):
+            paths = self._names.get(key)
+            if paths is not None:
+                paths.pop(path, None)
+                if not paths:
+                    del self._names[key]
+        self._unread.discard(path)
+        self._forget_id(path)
+        
+    @staticmethod
+    def _contains(root: str, path: str) -> bool:
+        if root == ".":
+            return not os.path.isabs(path) and not path.startswith(os.pardir + os.sep)
+        return path.startswith(root + os.sep)
+    
+    def _root_of(self, path: str) -> int:
+        """Return the position of the first root a path is under."""
+        return next((order for order, root in enumerate(self._roots) if self._contains(root, path)),
+                    len(self._roots))
+    
+    def _read_ids(self):
+        while self._unread:
+            self._read_id(self._unread.pop())
+            
+    def _read_id(self, path: str):
+        """Record the frontmatter ``id`` of a file along with its mtime."""
+        self._forget_id(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            header = self.parser.parse_file(path, header_only=True)
+        except (OSError, ValueError):
+            return
+        # Level 1 means the frontmatter itself has an id; otherwise it is the file stem
+        if header["level"] == 1:
+            spec_id = str(header["metadata"]["id"])
+            self._file_ids[path] = (mtime, spec_id)
+            self._ids.setdefault(spec_id, set()).add(path)
+            
+    def _forget_id(self, path: str):
+        entry = self._file_ids.pop(path, None)
+        if entry is not None:
+            paths = self._ids[entry[1]]
+            paths.discard(path)
+            if not paths:
+                del self._ids[entry[1]]
+                
+    def _check_id(self, path: str) -> Optional[str]:
+        """Return the current frontmatter ``id`` of an indexed file, re-reading it if it changed."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._forget_id(path)
+            return None
+        if self._file_ids[path][0] != mtime:
+            self._read_id(path)
+        entry = self._file_ids.get(path)
+        return entry[1] if entry is not None else None
 
 
 class MSLResolver:
-    """Resolve inheritance and merge specifications."""
+    """Resolve inheritance and merge specifications.
+    
+    The ``requirements`` of resolved specs are ``MergedRequirements``
+    sequences that share what they inherit with their ancestors.
     
-    def __init__(self, base_path: str = "."):
+    Resolved specs are cached under a hash of the content of every file on
+    their ``extends`` chain, so a change to any ancestor gives its
+    descendants new keys and they are resolved again. Each ``resolve`` call
+    stats the files on the chain and only reads the ones that changed.
+    
+    ``max_entries`` bounds the in-memory cache, dropping the least recently
+    used results, for long-running processes. With a ``cache`` directory
+    store (a ``ParseCache``), the specs passed to ``resolve`` also persist
+    between runs; that pays off for short runs resolving a few specs with
+    long chains more than for resolving a whole tree at once.
+    
+    Specs are looked up under ``base_path`` and then ``search_paths`` (see
+    ``SpecIndex``). Without ``search_paths`` they are taken from the
+    ``resolver`` section of the .mslrc that applies to ``base_path``.
+    """
+    
+    def __init__(self, base_path: str = ".", cache: Optional[ParseCache] = None,
+                 max_entries: Optional[int] = None, search_paths: Optional[Sequence[str]] = None):
         self.base_path = Path(base_path)
+        if search_paths is None:
+            search_paths = ResolverConfig.find_config(base_path).search_paths
+        self.search_paths = list(search_paths)
         self.parser = MSLParser()
-        self._cache = {}
+        self.index = SpecIndex(base_path, search_paths=self.search_paths)
+        self.cache = cache
+        self.max_entries = max_entries
+        self._cache = OrderedDict()  # chain key -> resolved spec
+        self._files = {}             # path -> (stat signature, digest, extends, frontmatter)
+        self._keys = {}              # (path, digest, parent key) -> chain key
+        self._extends_of = {}        # path -> the spec ID it extends, for dependents()
+        self._extenders = {}         # spec ID -> paths that extend it
+        self._version = f"{RESOLVER_VERSION}:{PARSER_VERSION}:{self.parser.grammar.fingerprint()}"
+        
+    def resolve(self, spec_id: str, lazy: bool = False) -> Mapping[str, Any]:
+        """Resolve a specification with all its inheritance.
+        
+        The ``extends`` chain is followed iteratively, so deep chains do not
+        grow the stack. A chain that comes back to one of its own specs
+        raises ValueError naming the whole cycle.
         
-    def resolve(self, spec_id: str) -> Dict[str, Any]:
-        """Resolve a specification with all its inheritance."""
-        if spec_id in self._cache:
-            return self._cache[spec_id]
+        With ``lazy=True`` a ``ResolvedView`` is returned instead. Only the
+        frontmatter of the files on the chain is parsed up front, and a field
+        is merged when it is read, starting from the nearest ancestor cached
+        in memory. Views are not cached themselves.
+        """
+        chain, keys = self._chain(spec_id)
+        
+        # Start from the nearest cached spec and merge back down
+        parent = None
+        start = len(chain)
+        for position, key in enumerate(keys):
+            parent = self._cache.get(key) if lazy else self._cache_get(key)
+            if parent is not None:
+                start = position
+                break
+        if lazy:
+            if parent is not None:
+                self._cache.move_to_end(keys[start])
+            docs = [self._lazy_document(path, data) for _, (path, _, _, data) in chain[:start]]
+            return ResolvedView(self, docs + [parent] if parent is not None else docs)
+            
+        cacheable = True
+        for position in range(start - 1, -1, -1):
+            path, digest, _, data = chain[position][1]
+            spec, current_digest = self._parse_spec(path, data)
+            if current_digest != digest:
+                # Changed while resolving; the result is not stored under stale keys
+                cacheable = False
+            if parent is not None:
+                spec = self._merge_specs(parent, spec)
+            else:
+                spec["requirements"] = MergedRequirements(spec.get("requirements", []))
+            if cacheable:
+                # Ancestors stay in memory; only what was asked for goes to disk
+                self._remember(keys[position], spec)
+                if position == 0 and self.cache is not None:
+                    self.cache.put(keys[0], spec)
+            parent = spec
+        return parent
+    
+    def _chain(self, spec_id: str) -> tuple[List[tuple], List[str]]:
+        """Return the ``(spec ID, spec file)`` pairs from a spec up to its root, with their keys."""
+        chain = []
+        positions = {}
+        current = spec_id
+        while True:
+            if current in positions:
+                cycle = [chain_id for chain_id, _ in chain[positions[current]:]] + [current]
+                raise ValueError(f"Circular inheritance: {' -> '.join(map(str, cycle))}")
+            positions[current] = len(chain)
+            spec_file = self._spec_file(current)
+            chain.append((current, spec_file))
+            extends = spec_file[2]
+            if extends is _NO_EXTENDS:
+                break
+            current = extends
             
-        # Load the spec
-        spec = self._load_spec(spec_id)
+        # Key each spec by its own content and its parent's key
+        keys = []
+        key = ""
+        for _, (path, digest, _, _) in reversed(chain):
+            key = self._chain_key(path, digest, key)
+            keys.append(key)
+        keys.reverse()
+        return chain, keys
+    
+    def resolve_all(self, paths: Iterable[str], jobs: Optional[int] = 1
+                    ) -> Iterator[tuple[str, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """Resolve many spec files, resolving each shared ancestor once.
         
-        # If it extends another spec, resolve parent first
-        if "extends" in spec.get("metadata", {}):
-            parent_id = spec["metadata"]["extends"]
-            parent = self.resolve(parent_id)
-            spec = self._merge_specs(parent, spec)
+        Builds the ``extends`` graph of ``paths`` and their ancestors, parses
+        the files whose results are not cached with ``parse_many`` (``jobs``
+        as there), then merges in topological order. Yields ``(path,
+        resolved, error)`` for each of ``paths``, parents before children. A
+        spec with a missing or circular ancestor yields its error as
+        ``resolve`` would raise it, without stopping the batch.
+        """
+        # Walk up from every path, collecting the graph
+        requested = {}
+        nodes = {}       # path -> (digest, extends, content) or an exception
+        parents = {}     # path -> parent path
+        refs = {}        # path -> the extends value that led to it
+        pending = []
+        for path in paths:
+            key = self.index._spell(path)
+            requested.setdefault(key, []).append(path)
+            pending.append(key)
+        while pending:
+            path = pending.pop()
+            if path in nodes:
+                continue
+            try:
+                _, digest, extends, data = self._file_info(path)
+            except (OSError, ValueError) as e:
+                nodes[path] = e
+                continue
+            nodes[path] = (digest, extends, data)
+            if extends is _NO_EXTENDS:
+                continue
+            parent = self.index._find(extends)
+            if parent is None:
+                nodes[path] = FileNotFoundError(f"Specification not found: {extends}")
+                continue
+            parents[path] = parent
+            refs.setdefault(parent, extends)
+            pending.append(parent)
             
-        self._cache[spec_id] = spec
-        return spec
+        # Topological order, failures passing down to descendants
+        children = {}
+        for path, parent in parents.items():
+            children.setdefault(parent, []).append(path)
+        order = []
+        errors = {}
+        queue = deque(path for path in nodes if path not in parents)
+        while queue:
+            path = queue.popleft()
+            order.append(path)
+            if isinstance(nodes[path], Exception):
+                errors[path] = nodes[path]
+            for child in children.get(path, ()):
+                if path in errors:
+                    errors[child] = errors[path]
+                queue.append(child)
+        in_order = set(order)
+        for path in nodes:
+            if path not in in_order:
+                errors[path] = self._cycle_error(path, parents, refs)
+                order.append(path)
+                
+        # Chain keys from the roots down
+        keys = {}
+        for path in order:
+            if path not in errors:
+                keys[path] = self._chain_key(path, nodes[path][0], keys.get(parents.get(path), ""))
+                
+        # Parse only what is needed: requested specs and the ancestors of
+        # those that are not cached
+        resolved = {}
+        wanted = set(requested)
+        to_parse = []
+        for path in reversed(order):
+            if path in wanted and path not in errors:
+                spec = self._cache_get(keys[path])
+                if spec is not None:
+                    resolved[path] = spec
+                else:
+                    to_parse.append(path)
+                    if path in parents:
+                        wanted.add(parents[path])
+        to_parse.reverse()
+        
+        parsed = {}
+        if jobs == 1 or len(to_parse) < 2:
+            for path in to_parse:
+                try:
+                    parsed[path] = self._parse_spec(path, nodes[path][2])
+                except (OSError, ValueError) as e:
+                    parsed[path] = e
+        else:
+            signatures = {path: self._files[path][0] for path in to_parse}
+            for path, spec, error in self.parser.parse_many(to_parse, jobs=jobs):
+                if error is not None:
+                    parsed[path] = error
+                    continue
+                # Results for files that changed since they were hashed are not cached
+                try:
+                    stat = os.stat(path)
+                    unchanged = (stat.st_mtime_ns, stat.st_size, stat.st_ino) == signatures[path]
+                except OSError:
+                    unchanged = False
+                parsed[path] = spec, nodes[path][0] if unchanged else None
+                
+        # Merge in topological order
+        uncacheable = set()
+        for path in order:
+            if path not in parsed or path in errors:
+                continue
+            parent = parents.get(path)
+            if parent in errors:
+                errors[path] = errors[parent]
+                continue
+            if isinstance(parsed[path], Exception):
+                errors[path] = parsed[path]
+                continue
+            spec, digest = parsed[path]
+            if parent is not None:
+                spec = self._merge_specs(resolved[parent], spec)
+            else:
+                spec["requirements"] = MergedRequirements(spec.get("requirements", []))
+            if digest != nodes[path][0] or parent in uncacheable:
+                uncacheable.add(path)
+            else:
+                self._remember(keys[path], spec)
+                if path in requested and self.cache is not None:
+                    self.cache.put(keys[path], spec)
+            resolved[path] = spec
+            
+        for path in order:
+            for original in requested.get(path, ()):
+                if path in errors:
+                    yield original, None, errors[path]
+                else:
+                    yield original, resolved[path], None
+                    
+    def dependents(self, spec: str, transitive: bool = True) -> List[str]:
+        """Return the files of the specs that extend a spec.
+        
+        ``spec`` is a spec ID or the path of a spec file. With ``transitive`` every descendant
+        is returned, parents before their children, so the specs affected by
+        a change can be revalidated in order; otherwise only direct children.
+        
+        The reverse ``extends`` index is built from the frontmatter of every
+        file under the base path on first use. Later calls rescan directories
+        that changed and stat each file, reading only the files that changed.
+        """
+        if str(spec).endswith(SpecIndex.SUFFIXES):
+            target = self.index._spell(spec)
+        else:
+            target = self.index._find(spec)
+            if target is None:
+                raise FileNotFoundError(f"Specification not found: {spec}")
+        self._update_extends()
+        
+        # Which file each extends value names can change as files come and go,
+        # so that is looked up per call
+        children = {}
+        for extends, paths in self._extenders.items():
+            parent = self.index._find(extends)
+            if parent is not None:
+                children.setdefault(parent, set()).update(paths)
+                
+        result = []
+        seen = {target}
+        queue = deque([target])
+        while queue:
+            for child in sorted(children.get(queue.popleft(), ())):
+                if child not in seen:
+                    seen.add(child)
+                    result.append(child)
+                    if transitive:
+                        queue.append(child)
+        return result
+    
+    def _update_extends(self):
+        """Bring the reverse ``extends`` index up to date with the files under the base path."""
+        paths = self.index.paths()
+        current = set(paths)
+        for path in [path for path in self._extends_of if path not in current]:
+            self._set_extends(path, None)
+        for path in paths:
+            try:
+                extends = self._file_info(path)[2]
+            except (OSError, ValueError):
+                extends = _NO_EXTENDS
+            self._set_extends(path, None if extends is _NO_EXTENDS else str(extends))
+            
+    def _set_extends(self, path: str, extends: Optional[str]):
+        old = self._extends_of.get(path)
+        if old == extends:
+            return
+        if old is not None:
+            paths = self._extenders[old]
+            paths.discard(path)
+            if not paths:
+                del self._extenders[old]
+        if extends is None:
+            del self._extends_of[path]
+        else:
+            self._extends_of[path] = extends
+            self._extenders.setdefault(extends, set()).add(path)
+            
+    def _cycle_error(self, path: str, parents: Dict[str, str], refs: Dict[str, str]) -> ValueError:
+        """Return the error ``resolve`` raises for a spec on or below a cycle."""
+        seen = {}
+        while path not in seen:
+            seen[path] = len(seen)
+            path = parents[path]
+        cycle = list(seen)[seen[path]:] + [path]
+        return ValueError(f"Circular inheritance: {' -> '.join(str(refs[node]) for node in cycle)}")
+    
+    def _spec_file(self, spec_id: str) -> tuple:
+        """Return (path, content digest, extends, content) for a spec ID.
         
-    def _load_spec(self, spec_id: str) -> Dict[str, Any]:
-        """Load a specification by ID."""
-        # Try to find the spec file
-        possible_paths = [
-            self.base_path / f"{spec_id}.md",
-            self.base_path / f"{spec_id}.msl",
-            self.base_path / "specs" / f"{spec_id}.md",
-            self.base_path / "templates" / f"{spec_id}.md",
-        ]
-        
-        for path in possible_paths:
-            if path.exists():
-                return self.parser.parse_file(str(path))
+        The file is only read if it changed since it was last seen; otherwise
+        the content is None.
+        """
+        path = self.index._find(spec_id)
+        if path is not None:
+            try:
+                return self._file_info(path)
+            except FileNotFoundError:
+                # Removed since it was indexed
+                self.index.refresh()
+                path = self.index._find(spec_id)
+                if path is not None:
+                    return self._file_info(path)
                 
         raise FileNotFoundError(f"Specification not found: {spec_id}")
+    
+    def _file_info(self, path: str) -> tuple:
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        known = self._files.get(path)
+        if known is not None and known[0] == signature:
+            return path, known[1], known[2], None
+            
+        with open(path, 'rb') as f:
+            data = f.read()
+        frontmatter = self.parser._extract_frontmatter(self.parser._decode(data))[0]
+        if isinstance(frontmatter, dict) and "extends" in frontmatter:
+            extends = frontmatter["extends"]
+        else:
+            extends = _NO_EXTENDS
+        digest = hashlib.sha256(data).hexdigest()
+        self._files[path] = (signature, digest, extends, frontmatter)
+        return path, digest, extends, data
+    
+    def _parse_spec(self, path: str, data: Optional[bytes] = None) -> tuple[Dict[str, Any], str]:
+        """Parse a spec file, or its already read ``data``, and return it with its digest."""
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        return self.parser.parse_content(self.parser._decode(data), path), hashlib.sha256(data).hexdigest()
+    
+    def _lazy_document(self, path: str, data: Optional[bytes] = None) -> LazyDocument:
+        """Return a spec file with the frontmatter read by ``_file_info`` and the rest deferred."""
+        frontmatter = self._files[path][3]
+        if isinstance(frontmatter, dict):
+            frontmatter = dict(frontmatter)
+        level, metadata = self.parser._header(frontmatter, path)
+        return LazyDocument(self.parser, path, level, metadata,
+                            self.parser._decode(data) if data is not None else None)
+    
+    def _chain_key(self, path: str, digest: str, parent_key: str) -> str:
+        key = self._keys.get((path, digest, parent_key))
+        if key is None:
+            hasher = hashlib.sha256()
+            for part in (self._version, path, digest, parent_key):
+                part = part.encode('utf-8')
+                hasher.update(len(part).to_bytes(8, 'little'))
+                hasher.update(part)
+            if len(self._keys) >= 65536:
+                # Mostly keys of old file versions by now
+                self._keys.clear()
+            key = self._keys[path, digest, parent_key] = hasher.hexdigest()
+        return key
+    
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        spec = self._cache.get(key)
+        if spec is not None:
+            self._cache.move_to_end(key)
+            return spec
+        if self.cache is not None:
+            spec = self.cache.get(key)
+            if spec is not None:
+                spec["requirements"] = MergedRequirements(spec["requirements"])
+                self._remember(key, spec)
+        return spec
+    
+    def _remember(self, key: str, spec: Dict[str, Any]):
+        self._cache[key] = spec
+        self._cache.move_to_end(key)
+        if self.max_entries is not None:
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
         
     def _merge_specs(self, parent: Dict[str, Any], child: Dict[str, Any]) -> Dict[str, Any]:
         """Merge parent and child specifications."""
@@ -71,36 +1153,41 @@ class MSLResolver:
             
         return result
         
-    def _merge_requirements(self, parent_reqs: List[Dict], child_reqs: List[Dict]) -> List[Dict]:
-        """Merge parent and child requirements based on inheritance markers."""
+    def _merge_requirements(self, parent_reqs: Sequence[Dict], child_reqs: List[Dict]) -> MergedRequirements:
+        """Merge parent and child requirements based on inheritance markers.
+        
+        The child's requirements come first, then the parent's it did not
+        match. A child requirement with ``[OVERRIDE]`` or the default inherit
+        replaces or updates the parent's requirement with its ID: among the
+        parent's requirements at the same place if it is there (the top
+        level, or the children of a matched requirement), otherwise wherever
+        it is in the parent's tree, e.g. a nested ``REQ-001.2.1``. Children of
+        matched requirements are merged the same way, so the parent's other
+        children are kept. ``[NEW]`` requirements are added as written.
+        
+        Parent requirements the child does not touch are shared, not copied.
+        """
+        if not isinstance(parent_reqs, MergedRequirements):
+            parent_reqs = MergedRequirements(list(parent_reqs))
+        parent_by_id = parent_reqs.layer()
+        merge = _TreeMerge(parent_by_id)
+        merge.collect(child_reqs, parent_by_id, top=True)
+        
         result = []
-        parent_by_id = {req["id"]: req for req in parent_reqs if req.get("id")}
         used_parent_ids = set()
-        
         for req in child_reqs:
-            inheritance = req.get("inheritance", "inherit")
-            req_id = req.get("id")
-            
-            if inheritance == "new":
-                # New requirement, just add it
-                result.append(req)
-            elif inheritance == "override" and req_id in parent_by_id:
-                # Override parent requirement
-                result.append(req)
-                used_parent_ids.add(req_id)
-            elif inheritance == "inherit" and req_id in parent_by_id:
-                # Inherit from parent (possibly with modifications)
-                parent_req = parent_by_id[req_id].copy()
-                parent_req.update(req)
-                result.append(parent_req)
-                used_parent_ids.add(req_id)
+            if id(req) in merge.moved:
+                # Applied where its ID is in the parent's tree
+                continue
+            target = merge.matched.get(id(req))
+            if target is not None:
+                result.append(merge.build(target, req, top=True))
+                used_parent_ids.add(req.get("id"))
             else:
-                # Default: add as is
-                result.append(req)
-                
-        # Add remaining parent requirements not overridden
-        for req_id, req in parent_by_id.items():
-            if req_id not in used_parent_ids:
-                result.append(req)
+                result.append(merge.written(req))
                 
-        return result
\ No newline at end of file
+        # Remaining parent requirements follow, through the parent's layer,
+        # with the edits below them applied in place
+        patches = {req_id: merge.retain(req) for req_id, req in merge.tops.items()
+                   if req_id not in used_parent_ids}
+        return MergedRequirements(result, parent_by_id, used_parent_ids, patches)
@@ -1,10 +1,13 @@
 """MSL Validator - Validate MSL documents against the specification."""
 
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 from pathlib import Path
 from .config import ValidationConfig, CustomValidators
 
+if TYPE_CHECKING:
+    from .parser import MSLParser
+
 
 class ValidationIssue:
     """Represents a validation issue."""
@@ -27,9 +30,11 @@ class ValidationIssue:
 class MSLValidator:
     """Validate MSL documents."""
     
-    def __init__(self, strict: bool = False, config: Optional[ValidationConfig] = None):
+    def __init__(self, strict: bool = False, config: Optional[ValidationConfig] = None,
+                 parser: Optional["MSLParser"] = None):
         self.strict = strict
         self.config = config or ValidationConfig.find_config()
+        self.parser = parser
         
         # Merge strict mode into config
         if self.strict:
@@ -43,11 +48,15 @@ class MSLValidator:
         """Validate a parsed MSL document."""
         issues = []
         
+        # Heading line of the requirements section, if the parser recorded it
+        section_line = parsed.get("sections", {}).get("requirements", (None,))[0]
+        
         # Check for requirements section (Level 1+)
         if parsed.get("level", 0) >= 1 and not parsed.get("requirements"):
             issues.append(ValidationIssue(
                 "warning",
-                "Missing ## Requirements section (required for Level 1+)"
+                "Missing ## Requirements section (required for Level 1+)",
+                section_line
             ))
             
         # Check for title
@@ -61,7 +70,7 @@ class MSLValidator:
         issues.extend(self._validate_metadata(parsed.get("metadata", {})))
         
         # Validate requirements
-        issues.extend(self._validate_requirements(parsed.get("requirements", [])))
+        issues.extend(self._validate_requirements(parsed.get("requirements", []), section_line))
         
         return issues
     
@@ -112,7 +121,16 @@ class MSLValidator:
                 
         return issues
     
-    def _validate_requirements(self, requirements: List[Dict[str, Any]]) -> List[ValidationIssue]:
+    def _position(self, requirement: Dict[str, Any], marker: bool = False) -> tuple:
+        """Return the (line, column) of a requirement or its marker block, if known."""
+        line = getattr(requirement, "line", None)
+        column = getattr(requirement, "column", None)
+        if marker:
+            column = getattr(requirement, "marker_column", None) or column
+        return line, column
+    
+    def _validate_requirements(self, requirements: List[Dict[str, Any]],
+                               section_line: Optional[int] = None) -> List[ValidationIssue]:
         """Validate requirements list with configuration rules."""
         issues = []
         seen_ids = {}
@@ -121,17 +139,21 @@ class MSLValidator:
         if self.config.min_requirements > 0 and len(requirements) < self.config.min_requirements:
             issues.append(ValidationIssue(
                 "warning",
-                f"Document has {len(requirements)} requirements, minimum required: {self.config.min_requirements}"
+                f"Document has {len(requirements)} requirements, minimum required: {self.config.min_requirements}",
+                section_line
             ))
         
         # Check maximum requirements count
         if len(requirements) > self.config.max_requirements:
             issues.append(ValidationIssue(
                 "warning",
-                f"Document has {len(requirements)} requirements, maximum allowed: {self.config.max_requirements}"
+                f"Document has {len(requirements)} requirements, maximum allowed: {self.config.max_requirements}",
+                section_line
             ))
         
         for i, req in enumerate(requirements):
+            position = self._position(req)
+            
             # Check for duplicate IDs
             if req.get("id"):
                 # Use configured pattern or fall back to standard patterns
@@ -140,7 +162,8 @@ class MSLValidator:
                     if not self.req_id_pattern.match(req["id"]):
                         issues.append(ValidationIssue(
                             "warning",
-                            f"Invalid requirement ID format: {req['id']}. Expected pattern: {self.config.id_format}"
+                            f"Invalid requirement ID format: {req['id']}. Expected pattern: {self.config.id_format}",
+                            *position
                         ))
                 else:
                     # Default: accept both flat and hierarchical IDs
@@ -148,13 +171,15 @@ class MSLValidator:
                             self.hierarchical_req_id_pattern.match(req["id"])):
                         issues.append(ValidationIssue(
                             "warning",
-                            f"Invalid requirement ID format: {req['id']}. Expected REQ-XXX or REQ-XXX.Y.Z"
+                            f"Invalid requirement ID format: {req['id']}. Expected REQ-XXX or REQ-XXX.Y.Z",
+                            *position
                         ))
                     
                 if req["id"] in seen_ids:
                     issues.append(ValidationIssue(
                         "error",
-                        f"Duplicate requirement ID: {req['id']} (first seen at requirement {seen_ids[req['id']] + 1})"
+                        f"Duplicate requirement ID: {req['id']} (first seen at requirement {seen_ids[req['id']] + 1})",
+                        *position
                     ))
                 else:
                     seen_ids[req["id"]] = i
@@ -163,7 +188,8 @@ class MSLValidator:
             if not req.get("text", "").strip():
                 issues.append(ValidationIssue(
                     "warning",
-                    f"Empty requirement at position {i + 1}"
+                    f"Empty requirement at position {i + 1}",
+                    *position
                 ))
             
             # Validate composite markers
@@ -187,7 +213,8 @@ class MSLValidator:
                 if missing_markers:
                     issues.append(ValidationIssue(
                         "warning",
-                        f"Requirement {req.get('id', i+1)} missing required markers: {', '.join(missing_markers)}"
+                        f"Requirement {req.get('id', i+1)} missing required markers: {', '.join(missing_markers)}",
+                        *self._position(req, marker=True)
                     ))
             
             # Check forbidden markers
@@ -196,7 +223,8 @@ class MSLValidator:
                     if forbidden in req.get("markers", {}) or forbidden in req.get("categories", []):
                         issues.append(ValidationIssue(
                             "warning",
-                            f"Requirement {req.get('id', i+1)} uses forbidden marker: {forbidden}"
+                            f"Requirement {req.get('id', i+1)} uses forbidden marker: {forbidden}",
+                            *self._position(req, marker=True)
                         ))
             
             # Validate code links
@@ -212,7 +240,8 @@ class MSLValidator:
                         severity = self.config.severity_overrides.get(validator_name, "warning")
                         issues.append(ValidationIssue(
                             severity,
-                            f"[{validator_name}] {req.get('id', f'requirement {i+1}')}: {issue_msg}"
+                            f"[{validator_name}] {req.get('id', f'requirement {i+1}')}: {issue_msg}",
+                            *position
                         ))
                 
         # Check for sequential IDs (optional)
@@ -223,7 +252,8 @@ class MSLValidator:
             if actual_ids and actual_ids != expected_ids[:len(actual_ids)]:
                 issues.append(ValidationIssue(
                     "info",
-                    "Requirement IDs are not sequential"
+                    "Requirement IDs are not sequential",
+                    section_line
                 ))
                 
         return issues
@@ -232,6 +262,7 @@ class MSLValidator:
         """Validate composite markers for consistency and correctness."""
         issues = []
         req_id = requirement.get("id", f"requirement {index + 1}")
+        position = self._position(requirement, marker=True)
         
         # Check for conflicting status markers
         status = requirement.get("status")
@@ -240,7 +271,8 @@ class MSLValidator:
         if status == "blocked" and status == "complete":
             issues.append(ValidationIssue(
                 "error",
-                f"Conflicting status in {req_id}: cannot be both blocked and complete"
+                f"Conflicting status in {req_id}: cannot be both blocked and complete",
+                *position
             ))
         
         # Validate metrics values
@@ -255,12 +287,14 @@ class MSLValidator:
                     if not 0 <= progress <= 100:
                         issues.append(ValidationIssue(
                             "warning",
-                            f"Progress in {req_id} should be between 0-100%: {progress_str}"
+                            f"Progress in {req_id} should be between 0-100%: {progress_str}",
+                            *position
                         ))
                 except ValueError:
                     issues.append(ValidationIssue(
                         "warning",
-                        f"Invalid progress format in {req_id}: {progress_str}"
+                        f"Invalid progress format in {req_id}: {progress_str}",
+                        *position
                     ))
         
         # Validate coverage percentage
@@ -272,12 +306,14 @@ class MSLValidator:
                     if not 0 <= coverage <= 100:
                         issues.append(ValidationIssue(
                             "warning",
-                            f"Coverage in {req_id} should be between 0-100%: {coverage_str}"
+                            f"Coverage in {req_id} should be between 0-100%: {coverage_str}",
+                            *position
                         ))
                 except ValueError:
                     issues.append(ValidationIssue(
                         "warning",
-                        f"Invalid coverage format in {req_id}: {coverage_str}"
+                        f"Invalid coverage format in {req_id}: {coverage_str}",
+                        *position
                     ))
         
         # Validate confidence levels
@@ -286,7 +322,8 @@ class MSLValidator:
             if metrics["confidence"] not in valid_confidence:
                 issues.append(ValidationIssue(
                     "warning",
-                    f"Invalid confidence in {req_id}: {metrics['confidence']}. Valid values: {', '.join(valid_confidence)}"
+                    f"Invalid confidence in {req_id}: {metrics['confidence']}. Valid values: {', '.join(valid_confidence)}",
+                    *position
                 ))
         
         # Validate stage transitions
@@ -303,7 +340,8 @@ class MSLValidator:
             if base_stage not in valid_stages:
                 issues.append(ValidationIssue(
                     "warning",
-                    f"Invalid stage in {req_id}: {stage}. Valid stages: {', '.join(valid_stages)}"
+                    f"Invalid stage in {req_id}: {stage}. Valid stages: {', '.join(valid_stages)}",
+                    *position
                 ))
         
         # Validate gap types
@@ -320,7 +358,8 @@ class MSLValidator:
             if gap_type not in valid_gaps:
                 issues.append(ValidationIssue(
                     "warning",
-                    f"Invalid gap type in {req_id}: {gap}. Valid types: {', '.join(valid_gaps)}"
+                    f"Invalid gap type in {req_id}: {gap}. Valid types: {', '.join(valid_gaps)}",
+                    *position
                 ))
         
         # Validate dependencies reference existing requirements
@@ -334,7 +373,8 @@ class MSLValidator:
                         if not self.req_id_pattern.match(dep):
                             issues.append(ValidationIssue(
                                 "warning",
-                                f"Invalid dependency format in {req_id} [{dep_type}]: {dep}"
+                                f"Invalid dependency format in {req_id} [{dep_type}]: {dep}",
+                                *position
                             ))
         
         return issues
@@ -351,7 +391,8 @@ class MSLValidator:
             if current_depth > max_depth:
                 issues.append(ValidationIssue(
                     "warning",
-                    f"Requirement hierarchy exceeds recommended depth of {max_depth} levels at {req.get('id', 'unknown')}"
+                    f"Requirement hierarchy exceeds recommended depth of {max_depth} levels at {req.get('id', 'unknown')}",
+                    *self._position(req)
                 ))
                 return current_depth
             
@@ -375,7 +416,8 @@ class MSLValidator:
                     if not child_id.startswith(expected_prefix):
                         issues.append(ValidationIssue(
                             "warning",
-                            f"Child requirement {child_id} doesn't follow parent ID pattern {expected_prefix}N"
+                            f"Child requirement {child_id} doesn't follow parent ID pattern {expected_prefix}N",
+                            *self._position(child)
                         ))
                     
                     # Check for duplicate child IDs
@@ -383,7 +425,8 @@ class MSLValidator:
                     if child_ids.count(child_id) > 1:
                         issues.append(ValidationIssue(
                             "error",
-                            f"Duplicate child ID {child_id} under parent {parent_id}"
+                            f"Duplicate child ID {child_id} under parent {parent_id}",
+                            *self._position(child)
                         ))
         
         # Validate child requirements recursively
@@ -397,6 +440,7 @@ class MSLValidator:
         """Validate code links in requirements."""
         issues = []
         req_id = requirement.get("id", f"requirement {index + 1}")
+        position = self._position(requirement, marker=True)
         
         for link in requirement.get("code_links", []):
             file_path = link.get("file", "")
@@ -405,7 +449,8 @@ class MSLValidator:
             if not file_path:
                 issues.append(ValidationIssue(
                     "warning",
-                    f"Empty file path in code link for {req_id}"
+                    f"Empty file path in code link for {req_id}",
+                    *position
                 ))
                 continue
             
@@ -429,7 +474,8 @@ class MSLValidator:
                     if not exists and self.strict:
                         issues.append(ValidationIssue(
                             "warning",
-                            f"Code link file not found: {file_path} in {req_id}"
+                            f"Code link file not found: {file_path} in {req_id}",
+                            *position
                         ))
             
             # Validate line numbers are numeric
@@ -439,7 +485,8 @@ class MSLValidator:
                 except ValueError:
                     issues.append(ValidationIssue(
                         "warning",
-                        f"Invalid line number '{link['line']}' in code link for {req_id}"
+                        f"Invalid line number '{link['line']}' in code link for {req_id}",
+                        *position
                     ))
             
             if "start_line" in link:
@@ -450,12 +497,14 @@ class MSLValidator:
                         if end < start:
                             issues.append(ValidationIssue(
                                 "warning",
-                                f"End line before start line in code link for {req_id}: {start}-{end}"
+                                f"End line before start line in code link for {req_id}: {start}-{end}",
+                                *position
                             ))
                 except ValueError:
                     issues.append(ValidationIssue(
                         "warning",
-                        f"Invalid line range in code link for {req_id}"
+                        f"Invalid line range in code link for {req_id}",
+                        *position
                     ))
             
             # Check direction is valid
@@ -464,7 +513,8 @@ class MSLValidator:
             if direction not in valid_directions:
                 issues.append(ValidationIssue(
                     "warning",
-                    f"Invalid link direction '{direction}' in {req_id}. Valid: {', '.join(valid_directions)}"
+                    f"Invalid link direction '{direction}' in {req_id}. Valid: {', '.join(valid_directions)}",
+                    *position
                 ))
         
         return issues
@@ -479,7 +529,7 @@ class MSLValidator:
         from .parser import MSLParser
         
         try:
-            parser = MSLParser()
+            parser = self.parser or MSLParser(keep_raw_content=False)
             parsed = parser.parse_file(file_path)
             issues = self.validate(parsed)
             
@@ -492,6 +542,27 @@ class MSLValidator:
         except Exception as e:
             return [ValidationIssue("error", f"Failed to parse file: {e}")]
     
+    def validate_files(self, file_paths: List[str], jobs: Optional[int] = None):
+        """Validate many files, parsing them in parallel worker processes.
+        
+        Yields ``(file_path, issues)`` in the order of ``file_paths``.
+        """
+        from .parser import MSLParser
+        
+        parser = self.parser or MSLParser(keep_raw_content=False)
+        for file_path, parsed, error in parser.parse_many(file_paths, jobs=jobs):
+            if error is not None:
+                issues = [ValidationIssue("error", f"Failed to parse file: {error}")]
+            else:
+                try:
+                    issues = self.validate(parsed)
+                except Exception as e:
+                    issues = [ValidationIssue("error", f"Failed to parse file: {e}")]
+                    
+            for issue in issues:
+                issue.file = file_path
+            yield file_path, issues
+    
     def validate_directory(self, directory: str, pattern: str = "**/*.md") -> Dict[str, List[ValidationIssue]]:
         """Validate all MSL files in a directory."""
         from pathlib import Path